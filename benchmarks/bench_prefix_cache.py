@@ -0,0 +1,50 @@
+"""Round trips saved by the parcel prefix cache.
+
+Types each address one character at a time (from the third character on,
+like ParcelTab) against the local stand-in server and counts the GIS
+requests with and without the cache:
+
+    python benchmarks/bench_prefix_cache.py
+"""
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from desoto.fake_county import PARCELS_FIXTURE, serve
+
+server = serve()
+os.environ["DESOTO_GIS_BASE"] = server.base_url
+
+from desoto.services import parcels  # noqa: E402  (needs the base URL set first)
+
+
+def typed(addresses, use_cache):
+    parcels._cache.clear()
+    before = server.stats.requests
+    for addr in addresses:
+        for end in range(3, len(addr) + 1):
+            parcels.query(addr[:end])
+            if not use_cache:
+                parcels._cache.clear()
+    return server.stats.requests - before
+
+
+def main():
+    with open(PARCELS_FIXTURE, encoding="utf-8") as f:
+        features = json.load(f)["features"]
+    addresses = [f["attributes"]["FULL_ADDR"] for f in features[::7]]
+    keystrokes = sum(len(a) - 2 for a in addresses)
+    without = typed(addresses, use_cache=False)
+    with_cache = typed(addresses, use_cache=True)
+    print(f"{len(addresses)} addresses, {keystrokes} keystrokes")
+    print(f"  without cache: {without} requests")
+    print(f"  with cache   : {with_cache} requests "
+          f"({100 * (1 - with_cache / without):.0f}% fewer, "
+          f"{parcels._cache.hits} answered locally)")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
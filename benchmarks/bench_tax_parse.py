@@ -0,0 +1,52 @@
+"""Parse-cost benchmark for tax estimator responses.
+
+Runs against the saved response in test/ so the numbers exclude network time.
+Every path extracts the same rows; they differ only in how the tree is
+built: the whole document with html.parser (the original code), the whole
+document with tax's parser (lxml when installed), and only <tr> elements
+with that parser (parse_estimate):
+
+    python benchmarks/bench_tax_parse.py [fixture.html ...]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+from desoto.services import tax
+
+FIXTURE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                       "test", "aptaxest7_response.html")
+
+
+def full_tree(parser):
+    def parse(html):
+        return tax._estimate_rows(BeautifulSoup(html, parser))
+    return parse
+
+
+def timed(fn, html, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn(html)
+    return (time.perf_counter() - start) / rounds * 1000
+
+
+def main(paths, rounds=500):
+    for path in paths:
+        with open(path, encoding="latin-1") as f:
+            html = f.read()
+        print(f"{os.path.basename(path)} ({len(html):,} bytes, {rounds} rounds, parser={tax._PARSER})")
+        assert full_tree("html.parser")(html) == tax.parse_estimate(html)
+        print(f"  full tree, html.parser : {timed(full_tree('html.parser'), html, rounds):.3f} ms")
+        if tax._PARSER != "html.parser":
+            print(f"  full tree, {tax._PARSER:<11} : {timed(full_tree(tax._PARSER), html, rounds):.3f} ms")
+        print(f"  <tr> only, {tax._PARSER:<11} : {timed(tax.parse_estimate, html, rounds):.3f} ms")
+        for label, amount in tax.parse_estimate(html):
+            print(f"    {label:<28} {amount:>10}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or [FIXTURE])
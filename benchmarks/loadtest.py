@@ -0,0 +1,102 @@
+"""Load test for the parcel and tax clients against the local stand-in server.
+
+Starts desoto.fake_county in-process (or targets --base-url) and hammers
+parcels.query and tax.fetch_total from a pool of workers:
+
+    python benchmarks/loadtest.py --workers 16 --duration 10 --latency 0.05 --error-rate 0.02
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PREFIXES = ["405 MA", "1", "22", "2260 GOOD", "7", "35", "9", "3", "5", "6"]
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    k = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[k]
+
+
+def report(name, samples, failures, elapsed):
+    ms = [s * 1000 for s in samples]
+    total = len(samples) + failures
+    print(f"{name:<8} {total:>6} calls  {total / elapsed:8.1f}/s  fail {failures:>4}  "
+          f"p50 {percentile(ms, 50):7.1f}  p90 {percentile(ms, 90):7.1f}  "
+          f"p99 {percentile(ms, 99):7.1f}  max {max(ms, default=0):7.1f} ms")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Load-test the county clients.")
+    ap.add_argument("--base-url", help="use a running stand-in instead of starting one")
+    ap.add_argument("--workers", type=int, default=8)
+    ap.add_argument("--duration", type=float, default=5.0, help="seconds")
+    ap.add_argument("--tax-share", type=float, default=0.2, help="fraction of calls that are tax lookups")
+    ap.add_argument("--latency", type=float, default=0.02)
+    ap.add_argument("--jitter", type=float, default=0.03)
+    ap.add_argument("--error-rate", type=float, default=0.0)
+    ap.add_argument("--max-rps", type=float, default=0.0)
+    args = ap.parse_args(argv)
+
+    server = None
+    base = args.base_url
+    if not base:
+        from desoto.fake_county import FakeConfig, serve
+        server = serve(config=FakeConfig(latency=args.latency, jitter=args.jitter,
+                                         error_rate=args.error_rate, max_rps=args.max_rps))
+        base = server.base_url
+    os.environ["DESOTO_GIS_BASE"] = base
+    os.environ["DESOTO_TAX_BASE"] = base
+
+    # Imported after the environment is set so the clients pick up the base URL.
+    from desoto.services import parcels, tax
+
+    results = {"parcels": ([], [0]), "tax": ([], [0])}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + args.duration
+
+    def worker(seed):
+        rng = random.Random(seed)
+        while time.perf_counter() < deadline:
+            kind = "tax" if rng.random() < args.tax_share else "parcels"
+            start = time.perf_counter()
+            try:
+                if kind == "tax":
+                    ok = tax.fetch_total(str(rng.randint(50, 400) * 750), "Southaven") is not None
+                else:
+                    # query() swallows errors and returns [], so an empty page counts as a failure.
+                    ok = bool(parcels.query(rng.choice(PREFIXES)))
+            except Exception:
+                ok = False
+            took = time.perf_counter() - start
+            samples, failures = results[kind]
+            with lock:
+                if ok:
+                    samples.append(took)
+                else:
+                    failures[0] += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        list(pool.map(worker, range(args.workers)))
+    elapsed = time.perf_counter() - started
+
+    print(f"{args.workers} workers for {elapsed:.1f}s against {base}")
+    for name, (samples, failures) in results.items():
+        report(name, samples, failures[0], elapsed)
+    if server:
+        s = server.stats
+        print(f"server: {s.requests} requests, {s.errors} injected errors, {s.throttled} throttled")
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
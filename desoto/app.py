@@ -1,7 +1,8 @@
 import ttkbootstrap as ttk
 from tkinterdnd2 import TkinterDnD, DND_FILES
+from desoto import jobs, perf, startup
 from desoto.data import SharedData
-from desoto.gui import ParcelTab, TaxTab, ProcessingTab
+from desoto.gui import ParcelTab, TaxTab, ProcessingTab, TimingsTab
 
 
 class App(ttk.Window, TkinterDnD.Tk):
@@ -18,7 +19,9 @@ class App(ttk.Window, TkinterDnD.Tk):
         except Exception:
             pass
 
-        self.shared_data = SharedData()
+        self.shared_data = SharedData(dispatch=jobs.post)
+        jobs.attach(self)  # worker results are dispatched on this Tk thread
+        log_path = perf.configure()
 
         nb = ttk.Notebook(self)
         nb.pack(expand=True, fill="both", padx=15, pady=15)
@@ -32,6 +35,18 @@ class App(ttk.Window, TkinterDnD.Tk):
         nb.add(parcel_tab, text="Parcel Finder")
         nb.add(tax_tab, text="Tax Calculator")
         nb.add(processing_tab, text="Processing")
+        nb.add(TimingsTab(nb, log_path), text="Timings")
+
+        startup.schedule_warm_up(self)  # PDF, docx and HTTP libraries load after the first frame
+
+        self.processing_tab = processing_tab
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+
+    def _on_close(self):
+        try:
+            self.processing_tab.save_session()
+        finally:
+            self.destroy()
 
 
 if __name__ == "__main__":
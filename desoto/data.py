@@ -1,43 +1,180 @@
 import threading
+import traceback
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping
+
+MAX_CASCADE = 5  # rounds of subscribers writing back before a loop is assumed
+
+DEFAULTS = {
+    # Parcel Info
+    "parcel_pin": "",
+    "parcel_address": "",
+    "parcel_owner": "",
+    "parcel_city_state_zip": "",
+    "parcel_legal_description": "",
+
+    # Tax Info
+    "tax_2024_total": "",
+    "tax_2024_paid_status": "",
+    "tax_2024_date_paid": "",
+    "tax_2025_estimated": "",
+
+    # Title Chain Info
+    "title_chain_results": (),
+
+    # Manual Fields
+    "lender": "",
+    "borrower": "",
+    "loan_amount": "",
+    # removed writer/date/notes
+}
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """One published version of the shared data; never changes."""
+    version: int
+    values: Mapping
+
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+
+    def __getitem__(self, key):
+        return self.values[key]
+
+
+def _freeze(value):
+    # A list stored in a snapshot could still be changed in place by its writer.
+    return tuple(value) if isinstance(value, list) else value
+
+
+def _call(fn, *args):
+    fn(*args)
+
 
 class SharedData:
-    """A thread-safe class to hold shared application data."""
+    """A thread-safe class to hold shared application data.
+
+    The data is published as immutable Snapshots. A writer copies the
+    current one, applies its whole batch and swaps the result in with a
+    single assignment, so readers take snapshot() or get_data() without
+    locking and never see half of an update_data call. Every change bumps
+    the version: a background job keeps the snapshot it started from and
+    asks changed_since() whether its inputs moved on.
 
-    def __init__(self):
-        self.lock = threading.Lock()
+    Widgets subscribe to the keys they show. A write that actually changes a
+    value queues a notification; a burst of writes is delivered as one batch,
+    with only the latest value per key, through dispatch(fn). The app passes
+    jobs.post so batches arrive on the Tk thread; by default they are
+    delivered synchronously.
+    Writes made by subscribers while a batch is delivered go out in the next
+    batch, and a chain of more than MAX_CASCADE such batches is dropped as a
+    feedback loop.
+    """
 
-        # Parcel Info
-        self.parcel_pin = ""
-        self.parcel_address = ""
-        self.parcel_owner = ""
-        self.parcel_city_state_zip = ""
-        self.parcel_legal_description = ""
+    def __init__(self, dispatch=None):
+        self._dispatch = dispatch or _call
+        self.lock = threading.Lock()  # serializes writers; readers never take it
+        self._state = Snapshot(0, MappingProxyType(dict(DEFAULTS)))
+        self._subscribers = {}   # key -> [callback(value)]
+        self._pending = {}       # key -> latest unpublished value
+        self._scheduled = False
+        self._delivering = False
+        self._depth = 0
+        self._next_depth = 0
 
-        # Tax Info
-        self.tax_2024_total = ""
-        self.tax_2024_paid_status = ""
-        self.tax_2024_date_paid = ""
-        self.tax_2025_estimated = ""
+    # ── snapshots ───────────────────────────────────────────────
+    def snapshot(self) -> Snapshot:
+        return self._state
 
-        # Title Chain Info
-        self.title_chain_results = []
+    @property
+    def version(self) -> int:
+        return self._state.version
 
-        # Manual Fields
-        self.lender = ""
-        self.borrower = ""
-        self.loan_amount = ""
-        # removed writer/date/notes
+    def changed_since(self, snapshot: Snapshot, keys=None) -> bool:
+        """True if any of keys (default: any key) differs from snapshot."""
+        current = self._state
+        if current.version == snapshot.version:
+            return False
+        if keys is None:
+            return True
+        return any(current.get(key) != snapshot.get(key) for key in keys)
 
     def get_data(self, key):
-        with self.lock:
-            return getattr(self, key, None)
+        return self._state.get(key)
 
     def set_data(self, key, value):
-        with self.lock:
-            setattr(self, key, value)
+        self._publish({key: value}, known_only=False)
 
     def update_data(self, data_dict):
+        self._publish(data_dict, known_only=True)
+
+    def _publish(self, changes, known_only):
+        with self.lock:
+            current = self._state.values
+            values = None
+            for key, value in changes.items():
+                if known_only and key not in current:
+                    continue
+                value = _freeze(value)
+                # Unchanged values publish nothing, which also ends echo loops
+                # between a subscriber's widget trace and this store.
+                if key in current and current[key] == value:
+                    continue
+                if values is None:
+                    values = dict(current)
+                values[key] = value
+                if key in self._subscribers:
+                    self._pending[key] = value
+            if values is not None:
+                self._state = Snapshot(self._state.version + 1, MappingProxyType(values))
+            schedule = self._schedule()
+        if schedule:
+            self._post_flush()
+
+    # ── change notifications ───────────────────────────────────
+    def subscribe(self, key, callback):
+        """Call callback(value) on the Tk thread when key changes; returns an unsubscribe function."""
+        with self.lock:
+            self._subscribers.setdefault(key, []).append(callback)
+
+        def unsubscribe():
+            with self.lock:
+                callbacks = self._subscribers.get(key, [])
+                if callback in callbacks:
+                    callbacks.remove(callback)
+        return unsubscribe
+
+    def _schedule(self):
+        # Lock held. True when the caller must post a flush.
+        if not self._pending or self._scheduled:
+            return False
+        self._scheduled = True
+        self._next_depth = self._depth + 1 if self._delivering else 0
+        return True
+
+    def _post_flush(self):
+        self._dispatch(self._flush)
+
+    def _flush(self):
         with self.lock:
-            for key, value in data_dict.items():
-                if hasattr(self, key):
-                    setattr(self, key, value)
+            pending, self._pending = self._pending, {}
+            self._scheduled = False
+            depth = self._next_depth
+            batch = [(value, list(self._subscribers.get(key, ()))) for key, value in pending.items()]
+        if depth > MAX_CASCADE:
+            print(f"SharedData: dropped a change loop on {', '.join(sorted(pending))}")
+            return
+        # A synchronous dispatch runs flushes inline, possibly inside another delivery.
+        outer = self._depth, self._delivering
+        self._depth, self._delivering = depth, True
+        try:
+            for value, callbacks in batch:
+                for callback in callbacks:
+                    try:
+                        callback(value)
+                    except Exception:
+                        traceback.print_exc()
+        finally:
+            self._depth, self._delivering = outer
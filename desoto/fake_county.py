@@ -0,0 +1,349 @@
+"""Local stand-in for the county GIS and tax estimator endpoints.
+
+Replays the recorded ArcGIS layer-29 features and the aptaxest7.pgm response
+kept in test/ so the clients can be benchmarked and load-tested without
+touching the production county servers. Point the clients at it with:
+
+    python -m desoto.fake_county --port 8765 --latency 0.08 --error-rate 0.02
+    DESOTO_GIS_BASE=http://127.0.0.1:8765 DESOTO_TAX_BASE=http://127.0.0.1:8765 python main.py
+
+DESOTO_GIS_BASE replaces the ArcGIS host in desoto.services.parcels and
+DESOTO_TAX_BASE the tax estimator host in desoto.services.tax. Both are
+read once, at import, so set them before the app or server starts.
+"""
+import argparse
+import json
+import os
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "test")
+PARCELS_FIXTURE = os.path.join(FIXTURE_DIR, "parcels_layer29.json")
+ESTIMATE_FIXTURE = os.path.join(FIXTURE_DIR, "aptaxest7_response.html")
+
+LAYER_PATH = "/arcgis/rest/services/CountyWebMap/County_Web_Map/MapServer/29"
+WELCOME_PATH = "/Webpgms/welcome.pgm"
+CGI_PATH = "/Webpgms/aptaxest7.pgm"
+
+
+@dataclass
+class FakeConfig:
+    latency: float = 0.0          # seconds added to every response
+    jitter: float = 0.0           # extra uniform random delay, seconds
+    error_rate: float = 0.0       # fraction of requests answered with HTTP 500
+    max_rps: float = 0.0          # token-bucket limit; over it answers HTTP 429 (0 = off)
+    max_record_count: int = 1000  # ArcGIS page size cap
+    parcels_path: str = PARCELS_FIXTURE
+    estimate_path: str = ESTIMATE_FIXTURE
+
+
+@dataclass
+class FakeStats:
+    requests: int = 0
+    errors: int = 0
+    throttled: int = 0
+    by_path: dict = field(default_factory=dict)
+
+
+# ── where-clause evaluation ───────────────────────────────────
+# Understands the subset of ArcGIS SQL the clients send: LIKE, =, <>, <, >,
+# IN (...), timestamp literals, UPPER(), AND/OR and parentheses.
+
+_CLAUSE_RE = re.compile(
+    r"^(?P<upper>UPPER\()?\s*(?P<field>\w+)\s*\)?\s*"
+    r"(?P<op>NOT\s+IN|LIKE|IN|<>|>=|<=|=|>|<)\s*(?P<value>.+)$",
+    re.I | re.S,
+)
+
+
+def _split_top(expr, word):
+    parts, depth, quoted, start, i = [], 0, False, 0, 0
+    token = f" {word} "
+    upper = expr.upper()
+    while i < len(expr):
+        ch = expr[i]
+        if ch == "'":
+            quoted = not quoted
+        elif not quoted and ch == "(":
+            depth += 1
+        elif not quoted and ch == ")":
+            depth -= 1
+        elif not quoted and depth == 0 and upper.startswith(token, i):
+            parts.append(expr[start:i])
+            i += len(token)
+            start = i
+            continue
+        i += 1
+    parts.append(expr[start:])
+    return [p.strip() for p in parts]
+
+
+def _wrapped(expr):
+    if not (expr.startswith("(") and expr.endswith(")")):
+        return False
+    depth, quoted = 0, False
+    for i, ch in enumerate(expr):
+        if ch == "'":
+            quoted = not quoted
+        elif not quoted and ch == "(":
+            depth += 1
+        elif not quoted and ch == ")":
+            depth -= 1
+            if depth == 0 and i < len(expr) - 1:
+                return False
+    return True
+
+
+def _literal(text):
+    text = text.strip()
+    if text.upper().startswith("TIMESTAMP"):
+        stamp = _literal(text[len("TIMESTAMP"):])
+        dt = datetime.strptime(stamp, "%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc)
+        return int(dt.timestamp() * 1000)
+    if text.startswith("'") and text.endswith("'"):
+        return text[1:-1].replace("''", "'")
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def _list_literal(text):
+    inner = text.strip()[1:-1]
+    items, buf, quoted = [], "", False
+    for ch in inner:
+        if ch == "'":
+            quoted = not quoted
+        if ch == "," and not quoted:
+            items.append(_literal(buf))
+            buf = ""
+        else:
+            buf += ch
+    if buf.strip():
+        items.append(_literal(buf))
+    return items
+
+
+def _like(pattern):
+    regex = "".join(".*" if c == "%" else "." if c == "_" else re.escape(c) for c in pattern)
+    return re.compile(f"^{regex}$", re.S)
+
+
+def matches(where, attrs):
+    """Evaluate an ArcGIS where clause against one feature's attributes."""
+    where = (where or "1=1").strip()
+    if _wrapped(where):
+        return matches(where[1:-1], attrs)
+    ors = _split_top(where, "OR")
+    if len(ors) > 1:
+        return any(matches(p, attrs) for p in ors)
+    ands = _split_top(where, "AND")
+    if len(ands) > 1:
+        return all(matches(p, attrs) for p in ands)
+    if where.replace(" ", "") == "1=1":
+        return True
+
+    m = _CLAUSE_RE.match(where)
+    if not m:
+        raise ValueError(f"Unsupported where clause: {where}")
+    actual = attrs.get(m["field"])
+    if m["upper"] and isinstance(actual, str):
+        actual = actual.upper()
+    op = " ".join(m["op"].upper().split())
+    if op in ("IN", "NOT IN"):
+        found = actual in _list_literal(m["value"])
+        return found if op == "IN" else not found
+    expected = _literal(m["value"])
+    if op == "LIKE":
+        return isinstance(actual, str) and bool(_like(expected).match(actual))
+    if actual is None:
+        return False
+    return {
+        "=": actual == expected, "<>": actual != expected,
+        ">": actual > expected, "<": actual < expected,
+        ">=": actual >= expected, "<=": actual <= expected,
+    }[op]
+
+
+# ── server ────────────────────────────────────────────────────
+class FakeCountyServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, config: FakeConfig):
+        super().__init__(address, _Handler)
+        self.config = config
+        self.stats = FakeStats()
+        self._lock = threading.Lock()
+        self._tokens = config.max_rps
+        self._refilled = time.monotonic()
+        with open(config.parcels_path, encoding="utf-8") as f:
+            self.layer = json.load(f)
+        with open(config.estimate_path, encoding="latin-1") as f:
+            self.estimate_html = f.read()
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def admit(self, path):
+        """Count the request and decide whether it is throttled."""
+        with self._lock:
+            self.stats.requests += 1
+            self.stats.by_path[path] = self.stats.by_path.get(path, 0) + 1
+            if self.config.max_rps <= 0:
+                return True
+            now = time.monotonic()
+            self._tokens = min(self.config.max_rps,
+                               self._tokens + (now - self._refilled) * self.config.max_rps)
+            self._refilled = now
+            if self._tokens < 1:
+                self.stats.throttled += 1
+                return False
+            self._tokens -= 1
+            return True
+
+    def query_layer(self, params):
+        if params.get("where", "").strip() == "":
+            raise ValueError("'where' parameter is required")
+        rows = [f["attributes"] for f in self.layer["features"]
+                if matches(params.get("where"), f["attributes"])]
+        if params.get("returnCountOnly", "false").lower() == "true":
+            return {"count": len(rows)}
+
+        for spec in reversed([s for s in params.get("orderByFields", "").split(",") if s.strip()]):
+            name, _, direction = spec.strip().partition(" ")
+            rows.sort(key=lambda a: (a.get(name) is None, a.get(name)),
+                      reverse=direction.strip().upper() == "DESC")
+
+        out_fields = [f.strip() for f in params.get("outFields", "*").split(",") if f.strip()]
+        if out_fields and out_fields != ["*"]:
+            rows = [{k: a.get(k) for k in out_fields} for a in rows]
+        if params.get("returnDistinctValues", "false").lower() == "true":
+            seen, distinct = set(), []
+            for a in rows:
+                key = tuple(a.items())
+                if key not in seen:
+                    seen.add(key)
+                    distinct.append(a)
+            rows = distinct
+
+        offset = int(params.get("resultOffset") or 0)
+        count = min(int(params.get("resultRecordCount") or self.config.max_record_count),
+                    self.config.max_record_count)
+        page = rows[offset:offset + count]
+        return {
+            "displayFieldName": self.layer.get("displayFieldName", ""),
+            "fields": self.layer.get("fields", []),
+            "features": [{"attributes": a} for a in page],
+            "exceededTransferLimit": offset + count < len(rows),
+        }
+
+    def layer_info(self):
+        return {
+            "id": 29,
+            "name": "Parcels",
+            "type": "Feature Layer",
+            "objectIdField": "OBJECTID",
+            "maxRecordCount": self.config.max_record_count,
+            "editFieldsInfo": {"editDateField": "last_edited_date"},
+            "fields": self.layer.get("fields", []),
+        }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: FakeCountyServer
+
+    def log_message(self, *_):
+        pass
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        self._route(url.path, {k: v[-1] for k, v in parse_qs(url.query).items()})
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length).decode("utf-8", "replace")
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        params.update({k: v[-1] for k, v in parse_qs(body).items()})
+        self._route(url.path, params)
+
+    def _route(self, path, params):
+        cfg = self.server.config
+        if path == "/_stats":
+            return self._send(200, "application/json", json.dumps(self.server.stats.__dict__))
+
+        if not self.server.admit(path):
+            return self._send(429, "text/plain", "Too Many Requests")
+        delay = cfg.latency + (random.uniform(0, cfg.jitter) if cfg.jitter else 0)
+        if delay:
+            time.sleep(delay)
+        if cfg.error_rate and random.random() < cfg.error_rate:
+            with self.server._lock:
+                self.server.stats.errors += 1
+            return self._send(500, "text/plain", "Internal Server Error")
+
+        if path == f"{LAYER_PATH}/query":
+            try:
+                payload = self.server.query_layer(params)
+            except ValueError as exc:
+                payload = {"error": {"code": 400, "message": "Unable to complete operation.",
+                                     "details": [str(exc)]}}
+            return self._send(200, "application/json", json.dumps(payload))
+        if path == LAYER_PATH:
+            return self._send(200, "application/json", json.dumps(self.server.layer_info()))
+        if path == WELCOME_PATH:
+            return self._send(200, "text/html", "<HTML><BODY>DeSoto County</BODY></HTML>")
+        if path == CGI_PATH:
+            return self._send(200, "text/html; charset=iso-8859-1", self.server.estimate_html)
+        self._send(404, "text/plain", "Not Found")
+
+    def _send(self, status, content_type, body):
+        data = body.encode("latin-1" if "iso-8859-1" in content_type else "utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def serve(host="127.0.0.1", port=0, config: FakeConfig | None = None) -> FakeCountyServer:
+    """Start the stand-in server on a background thread and return it."""
+    server = FakeCountyServer((host, port), config or FakeConfig())
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--latency", type=float, default=0.0, help="seconds added to each response")
+    ap.add_argument("--jitter", type=float, default=0.0, help="extra random delay, seconds")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="fraction answered with HTTP 500")
+    ap.add_argument("--max-rps", type=float, default=0.0, help="throttle above this rate (HTTP 429)")
+    ap.add_argument("--parcels", default=PARCELS_FIXTURE, help="recorded layer-29 features (JSON)")
+    ap.add_argument("--estimate", default=ESTIMATE_FIXTURE, help="recorded aptaxest7.pgm response")
+    args = ap.parse_args(argv)
+
+    config = FakeConfig(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                        max_rps=args.max_rps, parcels_path=args.parcels,
+                        estimate_path=args.estimate)
+    server = FakeCountyServer((args.host, args.port), config)
+    print(f"Fake county endpoints on {server.base_url}")
+    print(f"  DESOTO_GIS_BASE={server.base_url} DESOTO_TAX_BASE={server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
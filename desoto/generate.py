@@ -0,0 +1,174 @@
+"""Headless batch generation of title documents from a manifest of orders.
+
+    python -m desoto.generate orders.json --out-dir out/ [--workers 4] [--template t.docx]
+
+The manifest is a JSON list of objects, or a CSV file with one order per
+row. Each order carries the Processing tab's fields (pin, address, owner,
+city, legal_desc, tax_2024_total, tax_2024_date_paid, tax_2025_est,
+lender, borrower), an optional output file name, and its chain as either
+
+  chain       rows of {date, grantor, grantee, instrument, book_page}
+              (a JSON string in CSV manifests), or
+  source_pdf  a comprehensive search PDF, processed as in the GUI; its
+              tax total and date paid fill any tax fields left blank.
+
+Orders render across a process pool whose workers compile the template
+once. Each document is written to a temporary file beside its target and
+moved into place, so a failed or interrupted render never leaves a
+partial .docx behind.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from desoto.services import docx_template
+from desoto.services.document_render import OrderSnapshot, render_document
+from desoto.services.title_chain import ChainEntry, parse_date
+
+TEMPLATE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        "templates", "td_tmplt2.docx")
+
+
+def _file_mode() -> int:
+    """Permissions open() gives a new file under the current umask."""
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+FILE_MODE = _file_mode()  # mkstemp files are 0600, and os.replace would keep that
+
+
+def load_manifest(path: str) -> list[dict]:
+    """Orders from a JSON list or CSV file, with source_pdf made absolute."""
+    if path.lower().endswith(".csv"):
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            orders = [dict(row) for row in csv.DictReader(f)]
+    else:
+        with open(path, encoding="utf-8") as f:
+            orders = json.load(f)
+        if isinstance(orders, dict):
+            orders = orders.get("orders", [])
+    base = os.path.dirname(os.path.abspath(path))
+    for order in orders:
+        if order.get("source_pdf"):
+            order["source_pdf"] = os.path.join(base, order["source_pdf"])
+    return orders
+
+
+def chain_rows(rows) -> list[ChainEntry]:
+    if isinstance(rows, str):
+        rows = json.loads(rows) if rows.strip() else []
+    entries = []
+    for row in rows or []:
+        date_string = str(row.get("date", "")).strip()
+        date = parse_date(date_string)
+        if date is None:
+            raise ValueError(f"Unreadable chain date: {date_string!r}")
+        entries.append(ChainEntry(date=date, date_string=date_string,
+                                  grantor=row.get("grantor", ""), grantee=row.get("grantee", ""),
+                                  instrument=row.get("instrument", ""),
+                                  book_page=row.get("book_page", ""), is_vesting=True))
+    return entries
+
+
+def output_name(order: dict, index: int) -> str:
+    name = order.get("output") or f"{order.get('pin') or f'order_{index + 1}'}.docx"
+    return name if name.lower().endswith(".docx") else name + ".docx"
+
+
+def _init_worker(template_path: str):
+    docx_template.get_plan(template_path)
+
+
+def generate_one(order: dict, template_path: str, output_path: str) -> dict:
+    """Render one order atomically; returns timings in seconds."""
+    started = time.perf_counter()
+    chain = chain_rows(order.get("chain"))
+    if order.get("source_pdf"):
+        from desoto.services.document_splitter import process_comprehensive_document
+        ok, msg, results = process_comprehensive_document(order["source_pdf"])
+        if not ok:
+            raise ValueError(msg)
+        chain = chain or results.get("chain_entries", [])
+        order = dict(order)
+        order["tax_2024_total"] = order.get("tax_2024_total") or results.get("tax_total") or ""
+        order["tax_2024_date_paid"] = order.get("tax_2024_date_paid") or results.get("tax_date_paid") or ""
+    prepared = time.perf_counter()
+
+    directory = os.path.dirname(os.path.abspath(output_path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(suffix=".docx.tmp", dir=directory)
+    os.close(fd)
+    try:
+        render_document(OrderSnapshot.from_mapping(order, chain), template_path, tmp)
+        os.chmod(tmp, FILE_MODE)
+        os.replace(tmp, output_path)
+    except BaseException:
+        os.remove(tmp)
+        raise
+    finished = time.perf_counter()
+    return {"prepare": prepared - started, "render": finished - prepared, "deeds": len(chain)}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("manifest", help="JSON or CSV file of orders")
+    ap.add_argument("--out-dir", default=".", help="directory for the generated documents")
+    ap.add_argument("--template", default=TEMPLATE)
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = ap.parse_args(argv)
+
+    orders = load_manifest(args.manifest)
+    if not orders:
+        print("No orders in manifest.")
+        return 1
+    template = os.path.abspath(args.template)
+    targets = [os.path.join(args.out_dir, output_name(o, i)) for i, o in enumerate(orders)]
+    seen, duplicates = set(), []
+    for target in targets:
+        key = os.path.normcase(os.path.abspath(target))
+        if key in seen:
+            duplicates.append(target)
+        seen.add(key)
+    if duplicates:
+        # Two orders for one file would race, and the last to finish would win.
+        print(f"Orders share output files: {', '.join(sorted(set(duplicates)))}")
+        return 1
+
+    started = time.perf_counter()
+    render_times, failures = [], 0
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker,
+                             initargs=(template,)) as pool:
+        futures = {pool.submit(generate_one, order, template, target): target
+                   for order, target in zip(orders, targets)}
+        for future in as_completed(futures):
+            target = futures[future]
+            try:
+                t = future.result()
+            except Exception as e:
+                failures += 1
+                print(f"  FAILED            {target}: {e}")
+                continue
+            render_times.append(t["render"])
+            prepare = f"  (+{t['prepare'] * 1000:.0f} ms prep)" if t["prepare"] >= 0.001 else ""
+            print(f"  {t['render'] * 1000:8.1f} ms  {t['deeds']:>3} deeds  {target}{prepare}")
+    elapsed = time.perf_counter() - started
+
+    done = len(render_times)
+    ordered = sorted(render_times)
+    print(f"{done} of {len(orders)} documents in {elapsed:.2f}s with {args.workers} workers "
+          f"({done / elapsed:.1f}/s), {failures} failed")
+    if ordered:
+        print(f"render ms: mean {sum(ordered) / done * 1000:.1f}  "
+              f"p50 {ordered[done // 2] * 1000:.1f}  max {ordered[-1] * 1000:.1f}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
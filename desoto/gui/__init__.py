@@ -1,3 +1,4 @@
 from .parcel_tab import ParcelTab
 from .tax_tab import TaxTab
 from .processing_tab import ProcessingTab
+from .timings_tab import TimingsTab
@@ -0,0 +1,158 @@
+from tkinter import ttk
+
+COLUMNS = (("Date", "date", "date_string"), ("Grantor", "grantor", "grantor"),
+           ("Grantee", "grantee", "grantee"), ("Instrument", "instrument", "instrument"),
+           ("Book-Page", "book_page", "book_page"))
+ROW_HEIGHT = 20   # ttk Treeview default, when the theme doesn't set one
+HEADER_HEIGHT = 26
+
+
+class ChainListView(ttk.Frame):
+    """Sortable list of ChainEntry rows that only creates Treeview items for the visible rows.
+
+    The entries live in a Python list; the Treeview holds one reusable item
+    per visible line, refilled as the list scrolls or changes. Sorting uses
+    the keys precomputed on each entry, so headers stay fast with thousands
+    of rows.
+    """
+
+    def __init__(self, parent, entries, on_activate=None):
+        super().__init__(parent)
+        self.entries = list(entries)
+        self.on_activate = on_activate
+        self.sort_field, self.sort_reverse = "date", False
+        self.top = 0
+        self.selected = None  # the selected ChainEntry, kept across scrolling
+        self._slots = []
+        try:
+            self.row_height = int(ttk.Style(self).lookup("Treeview", "rowheight") or ROW_HEIGHT)
+        except Exception:
+            self.row_height = ROW_HEIGHT
+
+        self.tree = ttk.Treeview(self, columns=[c for c, _, _ in COLUMNS], show="headings",
+                                 selectmode="browse", height=1)
+        for col, field, _ in COLUMNS:
+            self.tree.heading(col, text=col, command=lambda f=field: self.sort_by(f, toggle=True))
+            self.tree.column(col, width=150, anchor="w")
+        self.vsb = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        self.vsb.grid(row=0, column=1, sticky="ns")
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(0, weight=1)
+
+        self.tree.bind("<Configure>", self._on_resize)
+        self.tree.bind("<<TreeviewSelect>>", self._on_select)
+        self.tree.bind("<Double-1>", self._on_double)
+        self.tree.bind("<MouseWheel>", lambda e: self.scroll(-3 if e.delta > 0 else 3, "units"))
+        self.tree.bind("<Button-4>", lambda e: self.scroll(-3, "units"))
+        self.tree.bind("<Button-5>", lambda e: self.scroll(3, "units"))
+        for key, (n, what) in {"<Up>": (-1, "units"), "<Down>": (1, "units"),
+                               "<Prior>": (-1, "pages"), "<Next>": (1, "pages")}.items():
+            self.tree.bind(key, lambda e, n=n, what=what: self._step(n, what))
+
+        self.sort_by("date")
+
+    # ── model ───────────────────────────────────────────────────
+    def sort_by(self, field, toggle=False):
+        if toggle:
+            self.sort_reverse = not self.sort_reverse if field == self.sort_field else False
+        self.sort_field = field
+        self.entries.sort(key=lambda e: e.sort_keys[field], reverse=self.sort_reverse)
+        arrow = " ↓" if self.sort_reverse else " ↑"
+        for col, f, _ in COLUMNS:
+            self.tree.heading(col, text=col + (arrow if f == field else ""))
+        self.render()
+
+    def add(self, entry):
+        """Insert one entry in sort order and show it."""
+        self.entries.append(entry)
+        # Timsort is linear on a list that is sorted but for one element.
+        self.entries.sort(key=lambda e: e.sort_keys[self.sort_field], reverse=self.sort_reverse)
+        self.render()
+
+    def remove(self, entry):
+        del self.entries[self._index(entry)]
+        if self.selected is entry:
+            self.selected = None
+        self.render()
+
+    def _index(self, entry):
+        # By identity: distinct entries can compare equal field for field.
+        return next(i for i, e in enumerate(self.entries) if e is entry)
+
+    # ── viewport ────────────────────────────────────────────────
+    def _visible(self):
+        return max(1, len(self._slots))
+
+    def _on_resize(self, event):
+        rows = max(1, (event.height - HEADER_HEIGHT) // self.row_height)
+        if rows != len(self._slots):
+            self.tree.delete(*self._slots)
+            self._slots = [self.tree.insert("", "end", iid=f"slot{i}") for i in range(rows)]
+            self.render()
+
+    def render(self):
+        """Refill the visible slots from the model and sync the scrollbar."""
+        total, rows = len(self.entries), self._visible()
+        self.top = max(0, min(self.top, total - rows))
+        show = None
+        for i, iid in enumerate(self._slots):
+            idx = self.top + i
+            if idx < total:
+                entry = self.entries[idx]
+                self.tree.item(iid, values=[getattr(entry, attr) for _, _, attr in COLUMNS])
+                if entry is self.selected:
+                    show = iid
+            else:
+                self.tree.item(iid, values=())
+        if show:
+            self.tree.selection_set(show)
+        elif self.tree.selection():
+            self.tree.selection_remove(*self.tree.selection())
+        if total:
+            self.vsb.set(self.top / total, min(1.0, (self.top + rows) / total))
+        else:
+            self.vsb.set(0.0, 1.0)
+
+    def scroll(self, n, what="units"):
+        step = n * (self._visible() if what == "pages" else 1)
+        self.top += step
+        self.render()
+
+    def _on_scrollbar(self, action, *args):
+        if action == "moveto":
+            self.top = int(float(args[0]) * len(self.entries))
+            self.render()
+        elif action == "scroll":
+            self.scroll(int(args[0]), args[1])
+
+    def _entry_at(self, iid):
+        if iid not in self._slots:
+            return None
+        idx = self.top + self._slots.index(iid)
+        return self.entries[idx] if idx < len(self.entries) else None
+
+    def _on_select(self, _):
+        sel = self.tree.selection()
+        entry = self._entry_at(sel[0]) if sel else None
+        if entry is not None:
+            self.selected = entry
+
+    def _step(self, n, what):
+        """Move the selection by rows or pages, scrolling when it leaves the view."""
+        if not self.entries:
+            return "break"
+        idx = self._index(self.selected) if self.selected is not None else self.top - n
+        idx = max(0, min(len(self.entries) - 1, idx + n * (self._visible() if what == "pages" else 1)))
+        self.selected = self.entries[idx]
+        if idx < self.top:
+            self.top = idx
+        elif idx >= self.top + self._visible():
+            self.top = idx - self._visible() + 1
+        self.render()
+        return "break"
+
+    def _on_double(self, event):
+        entry = self._entry_at(self.tree.identify_row(event.y))
+        if entry is not None and self.on_activate:
+            self.on_activate(entry)
@@ -1,6 +1,9 @@
-import threading, tkinter as tk
-from tkinter import ttk
-from desoto.services import query_parcels
+import time, tkinter as tk
+from tkinter import ttk, messagebox
+from desoto import jobs
+from desoto import services  # resolved per call: the parcel client loads after the window
+
+DEBOUNCE_MS = 250  # quiet period after the last keystroke before querying
 
 
 class ParcelTab(ttk.Frame):
@@ -20,7 +23,11 @@ class ParcelTab(ttk.Frame):
         search_frame.grid(row=0, column=0, sticky="ew", pady=(0, 15))
         search_frame.columnconfigure(1, weight=1)
 
-        ttk.Label(search_frame, text="Address:").grid(row=0, column=0, sticky="w", padx=(0, 10))
+        self.mode_var = tk.StringVar(value="Address")
+        mode_cmb = ttk.Combobox(search_frame, textvariable=self.mode_var, state="readonly",
+                                values=["Address", "Owner", "Subdivision"], width=12)
+        mode_cmb.grid(row=0, column=0, sticky="w", padx=(0, 10))
+        mode_cmb.bind("<<ComboboxSelected>>", self.on_mode)
 
         self.addr_var = tk.StringVar()
         self.addr_entry = ttk.Entry(search_frame, textvariable=self.addr_var)
@@ -30,6 +37,9 @@ class ParcelTab(ttk.Frame):
         refresh_btn = ttk.Button(search_frame, text="Refresh", command=self.on_refresh)
         refresh_btn.grid(row=0, column=2, sticky="e", padx=(10, 0))
 
+        bulk_btn = ttk.Button(search_frame, text="Bulk…", command=self.open_bulk_dialog)
+        bulk_btn.grid(row=0, column=3, sticky="e", padx=(10, 0))
+
         self.addr_entry.bind("<KeyRelease>", self.on_type)
         self.addr_entry.bind("<Return>", self.on_enter)
 
@@ -73,22 +83,64 @@ class ParcelTab(ttk.Frame):
         self.subd_var = add_row("Subdivision:", 5)
         self.lot_var = add_row("Lot:", 6)
 
+        # --- Status Bar ---
+        self.status_var = tk.StringVar()
+        ttk.Label(self, textvariable=self.status_var, font=("Segoe UI", 9))\
+           .grid(row=3, column=0, sticky="w", pady=(10, 0))
+
         self.results: list[dict] = []
+        self._debounce_id = None
+        self._job = None         # in-flight query, stream or bulk lookup
+        self._query_seq = 0      # bumped on every edit; only the newest query may populate
+        self._pick_seq = 0       # same for detail fetches after a selection
+        self._last_text = ""
 
     # ── autocomplete helpers ───────────────────────────────────
     def on_type(self, *_):
+        if self.mode_var.get() != "Address":
+            return  # owner/subdivision searches run on Enter
         txt = self.addr_var.get()
+        if txt == self._last_text:
+            return  # navigation / modifier keys
+        self._last_text = txt
+        self._cancel_pending()
         if len(txt) < 3:
             self.tree.delete(*self.tree.get_children())
+            self.status_var.set("")
             return
-        threading.Thread(target=self.populate, args=(txt,), daemon=True).start()
+        self._debounce_id = self.after(DEBOUNCE_MS, self._start_query, txt, self._query_seq)
+
+    def _cancel_pending(self):
+        """Drop the scheduled query and mark anything in flight as stale."""
+        if self._debounce_id is not None:
+            self.after_cancel(self._debounce_id)
+            self._debounce_id = None
+        if self._job is not None:
+            self._job.cancel()
+            self._job = None
+        self._query_seq += 1
+
+    def _start_query(self, text, seq):
+        self._debounce_id = None
+        self.status_var.set(f"Searching {text!r} …")
+        self._job = jobs.submit(self._query_thread, text, seq, category="parcel")
 
-    def populate(self, text):
-        self.results = query_parcels(text)
+    def _query_thread(self, text, seq):
+        start = time.perf_counter()
+        rows = services.suggest_parcels(text)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if seq == self._query_seq:
+            jobs.post(self.populate, text, rows, seq, elapsed_ms)
+
+    def populate(self, text, rows, seq, elapsed_ms):
+        if seq != self._query_seq:
+            return  # superseded while waiting for the UI thread
+        self.results = rows
         self.tree.delete(*self.tree.get_children())
         for i, attr in enumerate(self.results):
             self.tree.insert("", "end", iid=str(i),
                              values=(attr["FULL_ADDR"], attr["PIN"]))
+        self.status_var.set(f"{len(rows)} result(s) for {text!r} in {elapsed_ms:.0f} ms")
 
     # ── selection display ───────────────────────────────────────
     def on_pick(self, *_):
@@ -97,6 +149,36 @@ class ParcelTab(ttk.Frame):
             return
         attr = self.results[int(sel[0])]
         self.addr_var.set(attr["FULL_ADDR"])
+        self._last_text = attr["FULL_ADDR"]  # don't re-query on the Return key release
+        self._pick_seq += 1
+        if "OWNER_NAME" in attr:
+            self.show_detail(attr)
+            return
+
+        # Suggestions carry only address and PIN; fetch the full record now.
+        self.parcel_var.set(attr["PIN"])
+        self.address_var.set(attr["FULL_ADDR"])
+        for var in (self.owner1_var, self.owner2_var, self.city_var, self.subd_var, self.lot_var):
+            var.set("")
+        self.status_var.set("Loading parcel details …")
+        jobs.submit(self._detail_thread, attr, self._pick_seq, category="parcel")
+
+    def _detail_thread(self, attr, seq):
+        start = time.perf_counter()
+        record = services.parcel_detail(attr["PIN"])
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        jobs.post(self._detail_done, attr, record, seq, elapsed_ms)
+
+    def _detail_done(self, attr, record, seq, elapsed_ms):
+        if seq != self._pick_seq:
+            return
+        if record is None:
+            self.status_var.set("Parcel details unavailable.")
+            return
+        self.show_detail(record)
+        self.status_var.set(f"Loaded details for {attr['PIN']} in {elapsed_ms:.0f} ms")
+
+    def show_detail(self, attr):
         self.parcel_var.set(attr["PIN"])
         self.address_var.set(attr["FULL_ADDR"])
         owner1 = attr.get("OWNER_NAME", "")
@@ -118,20 +200,114 @@ class ParcelTab(ttk.Frame):
             "parcel_city_state_zip": f'{attr.get("CITY","")}, {attr.get("STATE","")} {attr.get("ZIP_CODE","")}',
             "parcel_legal_description": f'Lot {attr.get("LOT", "")}, {attr.get("SUBD_NAME", "")}',
         })
-        # Auto-update processing tab
-        self.processing_tab.load_from_tabs()
 
     # ── Enter selects first result ──────────────────────────────
     def on_enter(self, *_):
+        mode = self.mode_var.get()
+        if mode != "Address":
+            text = self.addr_var.get().strip()
+            if len(text) >= 2:
+                self._start_stream(mode, text)
+            return
         items = self.tree.get_children()
         if items:
             self.tree.selection_set(items[0])
             self.on_pick()
 
+    # ── Owner / subdivision search, streamed page by page ───────
+    def on_mode(self, *_):
+        self._cancel_pending()
+        self._last_text = ""
+        self.tree.delete(*self.tree.get_children())
+        mode = self.mode_var.get()
+        self.status_var.set("" if mode == "Address" else f"Type a {mode.lower()} name and press Enter.")
+        self.addr_entry.focus()
+
+    def _start_stream(self, mode, text):
+        self._cancel_pending()
+        seq = self._query_seq
+        self.results = []
+        self.tree.delete(*self.tree.get_children())
+        self.status_var.set(f"Searching {mode.lower()} {text!r} …")
+        self._job = jobs.submit(self._stream_thread, mode, text, seq, category="parcel")
+
+    def _stream_thread(self, mode, text, seq):
+        start = time.perf_counter()
+        try:
+            for page in services.iter_parcel_search(mode, text):
+                if seq != self._query_seq:
+                    return  # superseded: stop requesting further pages
+                jobs.post(self._append_rows, page, seq)
+        except Exception as e:
+            jobs.post(self._stream_done, seq, 0, f"Search failed: {e}")
+            return
+        jobs.post(self._stream_done, seq, (time.perf_counter() - start) * 1000, None)
+
+    def _append_rows(self, rows, seq):
+        if seq != self._query_seq:
+            return
+        base = len(self.results)
+        self.results.extend(rows)
+        for i, attr in enumerate(rows, base):
+            self.tree.insert("", "end", iid=str(i), values=(attr["FULL_ADDR"], attr["PIN"]))
+        self.status_var.set(f"{len(self.results)} parcel(s) so far …")
+
+    def _stream_done(self, seq, elapsed_ms, error):
+        if seq != self._query_seq:
+            return
+        if error:
+            self.status_var.set(error)
+        else:
+            self.status_var.set(f"{len(self.results)} parcel(s) in {elapsed_ms:.0f} ms")
+
+    # ── Bulk lookup by PIN / address list ───────────────────────
+    def open_bulk_dialog(self):
+        win = tk.Toplevel(self)
+        win.title("Bulk Parcel Lookup")
+        win.geometry("480x420")
+        ttk.Label(win, text="One PIN or full address per line:").pack(anchor="w", padx=10, pady=(10, 5))
+        text = tk.Text(win, height=16)
+        text.pack(fill="both", expand=True, padx=10)
+
+        def run():
+            items = [ln.strip() for ln in text.get("1.0", "end").splitlines() if ln.strip()]
+            if not items:
+                return
+            win.destroy()
+            self._cancel_pending()
+            self.status_var.set(f"Resolving {len(items)} parcel(s) …")
+            self._job = jobs.submit(self._bulk_thread, items, self._query_seq,
+                                    category="parcel", priority=jobs.BACKGROUND)
+
+        ttk.Button(win, text="Look Up", command=run).pack(anchor="e", padx=10, pady=10)
+        text.focus()
+
+    def _bulk_thread(self, items, seq):
+        start = time.perf_counter()
+        rows, unmatched = services.resolve_parcels(items)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        jobs.post(self._bulk_done, [r for r in rows if r], unmatched, seq, elapsed_ms)
+
+    def _bulk_done(self, rows, unmatched, seq, elapsed_ms):
+        if seq != self._query_seq:
+            return
+        self.results = rows
+        self.tree.delete(*self.tree.get_children())
+        for i, attr in enumerate(rows):
+            self.tree.insert("", "end", iid=str(i), values=(attr["FULL_ADDR"], attr["PIN"]))
+        self.status_var.set(f"Resolved {len(rows)} of {len(rows) + len(unmatched)} "
+                            f"in {elapsed_ms:.0f} ms")
+        if unmatched:
+            messagebox.showwarning("Unmatched Parcels",
+                                   f"{len(unmatched)} item(s) not found:\n\n" + "\n".join(unmatched))
+
     # ── Refresh clears everything ───────────────────────────────
     def on_refresh(self, *_):
+        self._cancel_pending()
+        self._last_text = ""
         self.addr_var.set("")
         self.tree.delete(*self.tree.get_children())
+        self.status_var.set("")
         self.parcel_var.set("")
         self.address_var.set("")
         self.owner1_var.set("")
@@ -1,21 +1,23 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 from tkinterdnd2 import DND_FILES
-from desoto.services.document_splitter import process_comprehensive_document
-from desoto.services.title_chain import process_title_document
-from desoto.services.tax_document import process_tax_document
-from docx.text.paragraph import Paragraph
-import threading
+from desoto import jobs, sessions
+from desoto.gui.chain_view import ChainListView
+from desoto import services  # PDF and docx services load on first use, not at startup
 import os
-from docx import Document
 import re
 import subprocess
 import sys
+import time
 
 class ProcessingTab(ttk.Frame):
     def __init__(self, parent, shared_data):
         super().__init__(parent, padding=20)
         self.shared_data = shared_data
+        self._doc_job = None  # in-flight search document parse
+        self._restoring = False  # filling the form from a saved order
+        self._recent = {}  # combobox label -> saved order key
+        self._session_key = None  # key the current order was last saved or reopened under
 
         # Main layout grid
         self.columnconfigure(0, weight=1)
@@ -98,6 +100,7 @@ class ProcessingTab(ttk.Frame):
         self.legal_desc_var = tk.StringVar()
         
         self._create_entry_row(prop_frame, "Parcel:", self.pin_var, 0)
+        self.pin_var.trace_add('write', lambda *_: self._pin_changed())
         self._create_entry_row(prop_frame, "Address:", self.address_var, 1)
         self._create_entry_row(prop_frame, "Owner:", self.owner_var, 2)
         self._create_entry_row(prop_frame, "City/State/ZIP:", self.city_var, 3)
@@ -155,6 +158,19 @@ class ProcessingTab(ttk.Frame):
         self.progress = ttk.Progressbar(doc_gen_frame, mode="indeterminate")
         self.progress.grid(row=2, column=0, columnspan=3, sticky="ew", pady=(10,0))
 
+        # --- Recent Orders ---
+        recent_frame = ttk.LabelFrame(right_frame, text="Recent Orders", padding=15)
+        recent_frame.grid(row=3, column=0, sticky="ew", pady=(20, 0))
+        recent_frame.columnconfigure(0, weight=1)
+        self.recent_var = tk.StringVar()
+        self.recent_combo = ttk.Combobox(recent_frame, textvariable=self.recent_var, state="readonly")
+        self.recent_combo.grid(row=0, column=0, sticky="ew", padx=(0, 10))
+        self.recent_combo.bind("<<ComboboxSelected>>", lambda _: self.open_recent())
+        ttk.Button(recent_frame, text="Open", command=self.open_recent).grid(row=0, column=1, sticky="e")
+
+        self._follow_shared_data()
+        self._refresh_recent()
+
     def _create_entry_row(self, parent, label_text, var, row, browse_btn=False, is_combo=False):
         ttk.Label(parent, text=label_text).grid(row=row, column=0, sticky="e", padx=(0, 10), pady=5)
         
@@ -192,6 +208,8 @@ class ProcessingTab(ttk.Frame):
         return entry
 
     def process_document_if_valid(self, var):
+        if self._restoring:
+            return  # a saved order brings its parsed results with it
         path = (var.get() or "").strip()
         if path and os.path.exists(path) and path.lower().endswith(('.pdf', '.docx')):
             self.process_search_document()
@@ -200,7 +218,8 @@ class ProcessingTab(ttk.Frame):
         if event:
             path = event.data.strip('{}')
             if path.lower().endswith(('.pdf', '.docx')):
-                self.search_doc_var.set(path)
+                self.search_doc_var.set(path)  # the variable's trace starts processing
+                return
         self.process_search_document()
 
     def browse_search_document(self):
@@ -229,103 +248,110 @@ class ProcessingTab(ttk.Frame):
         file_path = self.search_doc_var.get().strip()
         if not file_path or not os.path.exists(file_path):
             return
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return
+        # The same file (unchanged on disk) attaches to a parse already in flight;
+        # a different file supersedes it.
+        key = ("search_document", os.path.abspath(file_path), st.st_size, st.st_mtime_ns)
+        if self._doc_job is not None and self._doc_job.key != key:
+            self._doc_job.cancel()
+        self._session_key = None  # a new document starts a new order
         
         self.process_status_var.set("Processing document...")
         self.title_summary_var.set("Processing...")
         self.tax_2024_total_var.set("Processing...")
         self.tax_2024_date_paid_var.set("Processing...")
+        self.show_progress("Reading document", 20)
         
-        threading.Thread(target=self._process_search_document_thread, args=(file_path,), daemon=True).start()
-
-    def _process_search_document_thread(self, file_path):
-        try:
-            # Update progress
-            self.after(0, lambda: self.show_progress("Reading document", 20))
-            
-            # Process the comprehensive document
-            success, msg, results = process_comprehensive_document(file_path)
-            
-            # Update progress
-            self.after(0, lambda: self.show_progress("Extracting data", 60))
-            
-            def update_ui():
-                self.show_progress("Finalizing results", 90)
-                
-                self.process_status_var.set(results.get('status', msg))
-                
-                # Update chain information
-                chain_entries = results.get('chain_entries', [])
-                all_entries = results.get('all_entries', [])
-                
-                if chain_entries:
-                    self.shared_data.set_data("title_chain_kept", chain_entries)
-                    self.shared_data.set_data("title_chain_all", all_entries)
-                    summary = f"Found {len(chain_entries)} vesting deeds in 24-month chain."
-                    self.title_summary_var.set(summary)
-                else:
-                    self.shared_data.set_data("title_chain_kept", [])
-                    self.shared_data.set_data("title_chain_all", [])
-                    self.title_summary_var.set("No chain data found.")
-                
-                # Update tax information
-                tax_total = results.get('tax_total')
-                tax_date_paid = results.get('tax_date_paid')
-                
-                if tax_total or tax_date_paid:
-                    self.tax_2024_total_var.set(tax_total or "")
-                    self.tax_2024_date_paid_var.set(tax_date_paid or "")
-                    if tax_date_paid:
-                        self.tax_2024_paid_var.set("PAID")
-                    
-                    self.shared_data.update_data({
-                        "tax_2024_total": tax_total or "",
-                        "tax_2024_date_paid": tax_date_paid or "",
-                        "tax_2024_paid_status": "PAID" if tax_date_paid else self.tax_2024_paid_var.get()
-                    })
-                else:
-                    self.tax_2024_total_var.set("")
-                    self.tax_2024_date_paid_var.set("")
-                
-                # Complete progress
-                self.show_progress("Processing complete!", 100)
-                
-                # Update status with results summary
-                status_parts = []
-                if chain_entries:
-                    status_parts.append(f"{len(chain_entries)} vesting deeds found")
-                if tax_total:
-                    status_parts.append(f"Tax: ${tax_total}")
-                if not status_parts:
-                    status_parts.append("No data extracted")
-                
-                final_status = "✓ " + " | ".join(status_parts) if success else "⚠ " + msg
-                self.process_status_var.set(final_status)
-                
-                # Hide progress bar after a short delay
-                self.after(1500, self.hide_progress)
-                    
-            self.after(0, update_ui)
-            
-        except Exception as e:
-            error_msg = f"Error processing document: {str(e)}"
-            self.after(0, lambda: self.process_status_var.set("Processing failed"))
-            self.after(0, lambda: self.hide_progress())
-            self.after(0, lambda: messagebox.showerror("Processing Error", error_msg))
-
-    def load_from_tabs(self):
-        self.pin_var.set(self.shared_data.get_data("parcel_pin") or "")
-        self.address_var.set(self.shared_data.get_data("parcel_address") or "")
-        self.owner_var.set(self.shared_data.get_data("parcel_owner") or "")
-        self.city_var.set(self.shared_data.get_data("parcel_city_state_zip") or "")
-        self.legal_desc_var.set(self.shared_data.get_data("parcel_legal_description") or "")
-        
-        self.tax_2024_total_var.set(self.shared_data.get_data("tax_2024_total") or "")
-        self.tax_2024_paid_var.set(self.shared_data.get_data("tax_2024_paid_status") or "PAID")
-        self.tax_2024_date_paid_var.set(self.shared_data.get_data("tax_2024_date_paid") or "")
-        self.tax_2025_est_var.set(self.shared_data.get_data("tax_2025_estimated") or "")
-
-        results = self.shared_data.get_data("title_chain_kept")
-        self.title_summary_var.set(f"{len(results)} vesting deeds found." if results else "No title chain data found.")
+        self._doc_job = jobs.submit(services.process_comprehensive_document, file_path,
+                                    category="document", key=key,
+                                    on_done=self._search_document_done,
+                                    on_error=self._search_document_failed)
+
+    def _search_document_done(self, outcome):
+        success, msg, results = outcome
+        self._doc_job = None
+        self.process_status_var.set(results.get('status', msg))
+
+        # Update chain information
+        chain_entries = results.get('chain_entries', [])
+        all_entries = results.get('all_entries', [])
+
+        if chain_entries:
+            self.shared_data.set_data("title_chain_kept", chain_entries)
+            self.shared_data.set_data("title_chain_all", all_entries)
+            summary = f"Found {len(chain_entries)} vesting deeds in 24-month chain."
+            self.title_summary_var.set(summary)
+        else:
+            self.shared_data.set_data("title_chain_kept", [])
+            self.shared_data.set_data("title_chain_all", [])
+            self.title_summary_var.set("No chain data found.")
+
+        # Update tax information
+        tax_total = results.get('tax_total')
+        tax_date_paid = results.get('tax_date_paid')
+
+        if tax_total or tax_date_paid:
+            self.tax_2024_total_var.set(tax_total or "")
+            self.tax_2024_date_paid_var.set(tax_date_paid or "")
+            if tax_date_paid:
+                self.tax_2024_paid_var.set("PAID")
+
+            self.shared_data.update_data({
+                "tax_2024_total": tax_total or "",
+                "tax_2024_date_paid": tax_date_paid or "",
+                "tax_2024_paid_status": "PAID" if tax_date_paid else self.tax_2024_paid_var.get()
+            })
+        else:
+            self.tax_2024_total_var.set("")
+            self.tax_2024_date_paid_var.set("")
+
+        # Complete progress
+        self.show_progress("Processing complete!", 100)
+
+        # Update status with results summary
+        status_parts = []
+        if chain_entries:
+            status_parts.append(f"{len(chain_entries)} vesting deeds found")
+        if tax_total:
+            status_parts.append(f"Tax: ${tax_total}")
+        if not status_parts:
+            status_parts.append("No data extracted")
+
+        final_status = "✓ " + " | ".join(status_parts) if success else "⚠ " + msg
+        self.process_status_var.set(final_status)
+
+        # Hide progress bar after a short delay
+        self.after(1500, self.hide_progress)
+        self.save_session()
+
+    def _search_document_failed(self, e):
+        self._doc_job = None
+        error_msg = f"Error processing document: {str(e)}"
+        self.process_status_var.set("Processing failed")
+        self.hide_progress()
+        messagebox.showerror("Processing Error", error_msg)
+
+    def _follow_shared_data(self):
+        """Update each field only when its own SharedData key changes."""
+        def follow(key, var, default=""):
+            def update(value):
+                value = value or default
+                if var.get() != value:
+                    var.set(value)
+            self.shared_data.subscribe(key, update)
+
+        follow("parcel_pin", self.pin_var)
+        follow("parcel_address", self.address_var)
+        follow("parcel_owner", self.owner_var)
+        follow("parcel_city_state_zip", self.city_var)
+        follow("parcel_legal_description", self.legal_desc_var)
+        follow("tax_2024_total", self.tax_2024_total_var)
+        follow("tax_2024_paid_status", self.tax_2024_paid_var, "PAID")
+        follow("tax_2024_date_paid", self.tax_2024_date_paid_var)
+        follow("tax_2025_estimated", self.tax_2025_est_var)
 
     def view_title_details(self):
         all_entries = self.shared_data.get_data("title_chain_all") or []
@@ -342,83 +368,30 @@ class ProcessingTab(ttk.Frame):
         paned_window = ttk.PanedWindow(details_win, orient=tk.VERTICAL)
         paned_window.pack(fill="both", expand=True, padx=10, pady=10)
 
-        cols = ("Date", "Grantor", "Grantee", "Instrument", "Book-Page")
-        sort_states = {'keep': {'col': 'Date', 'rev': True}, 'other': {'col': 'Date', 'rev': True}}
+        kept_keys = {e.key for e in kept_entries}
+        views = {}
 
-        def sort_tree(tree, tree_key, col):
-            state = sort_states[tree_key]
-            reverse = not state['rev'] if state['col'] == col else False
-            state.update({'col': col, 'rev': reverse})
+        def move_item(entry, source):
+            target = views['other' if source == 'keep' else 'keep']
+            views[source].remove(entry)
+            target.add(entry)
 
-            items = [(tree.set(child, col), child) for child in tree.get_children('')]
-            
-            if col == 'Date':
-                from datetime import datetime
-                items.sort(key=lambda it: datetime.strptime(it[0], "%m/%d/%Y"), reverse=reverse)
-            elif col == 'Book-Page':
-                items.sort(key=lambda it: [int(p) for p in re.match(r'(\d+)-(\d+)', it[0]).groups()] if re.match(r'(\d+)-(\d+)', it[0]) else [0,0], reverse=reverse)
-            else:
-                items.sort(key=lambda it: it[0].lower(), reverse=reverse)
-
-            for index, (_, child) in enumerate(items):
-                tree.move(child, '', index)
-
-            for c in cols:
-                arrow = ' ↓' if reverse else ' ↑'
-                tree.heading(c, text=c + (arrow if c == col else ''))
-
-        def create_tree_view(parent, key):
-            frame = ttk.LabelFrame(parent, text="Kept" if key == 'keep' else "Other Entries", padding=10)
-            parent.add(frame, weight=1 if key == 'keep' else 2)
-            tree = ttk.Treeview(frame, columns=cols, show="headings")
-            for col in cols:
-                tree.heading(col, text=col, command=lambda c=col, t=tree, k=key: sort_tree(t, k, c))
-                tree.column(col, width=150, anchor="w")
-            tree.pack(fill="both", expand=True)
-            return tree
-
-        keep_tree = create_tree_view(paned_window, 'keep')
-        other_tree = create_tree_view(paned_window, 'other')
-
-        all_entries_map = {(e.date_string, e.book_page, e.instrument): e for e in all_entries}
-        
-        def populate_trees():
-            kept_set = {(e.date_string, e.book_page, e.instrument) for e in kept_entries}
-            
-            for tree in [keep_tree, other_tree]:
-                for item in tree.get_children():
-                    tree.delete(item)
-
-            for entry in sorted(all_entries, key=lambda e: e.date, reverse=True):
-                values = (entry.date_string, entry.grantor, entry.grantee, entry.instrument, entry.book_page)
-                key = (entry.date_string, entry.book_page, entry.instrument)
-                (keep_tree if key in kept_set else other_tree).insert("", "end", values=values)
-
-            sort_tree(keep_tree, 'keep', 'Date')
-            sort_tree(other_tree, 'other', 'Date')
-
-        def move_item(from_tree, to_tree, event):
-            selected_item = from_tree.selection()
-            if not selected_item: return
-            item_values = from_tree.item(selected_item, "values")
-            to_tree.insert("", "end", values=item_values)
-            from_tree.delete(selected_item)
-
-        keep_tree.bind("<Double-1>", lambda e: move_item(keep_tree, other_tree, e))
-        other_tree.bind("<Double-1>", lambda e: move_item(other_tree, keep_tree, e))
+        for key, title, weight in (('keep', "Kept", 1), ('other', "Other Entries", 2)):
+            frame = ttk.LabelFrame(paned_window, text=title, padding=10)
+            paned_window.add(frame, weight=weight)
+            entries = [e for e in all_entries if (e.key in kept_keys) == (key == 'keep')]
+            views[key] = ChainListView(frame, entries, on_activate=lambda e, k=key: move_item(e, k))
+            views[key].pack(fill="both", expand=True)
 
         def on_close():
-            new_kept_keys = {tuple(keep_tree.item(child, "values")) for child in keep_tree.get_children()}
-            new_kept_entries = [all_entries_map.get((v[0], v[4], v[3])) for v in new_kept_keys]
-            new_kept_entries = [e for e in new_kept_entries if e]
-            new_kept_entries.sort(key=lambda e: e.date, reverse=True)
+            new_kept_entries = sorted(views['keep'].entries, key=lambda e: e.date, reverse=True)
             
             self.shared_data.set_data("title_chain_kept", new_kept_entries)
             self.title_summary_var.set(f"{len(new_kept_entries)} vesting deeds in chain.")
             details_win.destroy()
+            self.save_session()
 
         details_win.protocol("WM_DELETE_WINDOW", on_close)
-        populate_trees()
 
     def browse_output(self):
         path = filedialog.asksaveasfilename(
@@ -471,9 +444,11 @@ class ProcessingTab(ttk.Frame):
         self.output_path_var.set(output_path)
         # --- END MODIFICATION ---
 
+        self.save_session()
         self.generate_btn.config(state="disabled")
         self.progress.start()
-        threading.Thread(target=self._generate_document_thread, args=(output_path,), daemon=True).start()
+        order = self._order_snapshot()
+        jobs.submit(self._generate_document_thread, output_path, order, category="document")
 
     def _open_file_os(self, path):
         """Opens a file with the default OS application in a cross-platform way."""
@@ -489,9 +464,10 @@ class ProcessingTab(ttk.Frame):
         except Exception as e:
             return False, f"Could not open file: {e}"
 
-    def _generate_document_thread(self, output_path):
+    def _generate_document_thread(self, output_path, order):
         try:
-            success, msg = self._create_full_document(output_path)
+            # order is the form as it was at the click; lookups landing since don't change it.
+            success, msg = self._create_full_document(output_path, order)
             
             final_msg = msg
             if success:
@@ -499,16 +475,16 @@ class ProcessingTab(ttk.Frame):
                 if not open_success:
                     final_msg += f"\n\nNote: {open_msg}"
             
-            self.after(0, lambda: messagebox.showinfo("Success", final_msg) if success else messagebox.showerror("Error", msg))
+            jobs.post(lambda: messagebox.showinfo("Success", final_msg) if success else messagebox.showerror("Error", msg))
 
         except Exception as e:
             error_msg = f"An unexpected error occurred: {str(e)}"
             import traceback
             traceback.print_exc()  # Print full traceback to console
-            self.after(0, lambda: messagebox.showerror("Error", error_msg))
+            jobs.post(messagebox.showerror, "Error", error_msg)
         finally:
-            self.after(0, self.progress.stop)
-            self.after(0, lambda: self.generate_btn.config(state="normal"))
+            jobs.post(self.progress.stop)
+            jobs.post(lambda: self.generate_btn.config(state="normal"))
 
     def get_template_path(self):
         try:
@@ -533,129 +509,101 @@ class ProcessingTab(ttk.Frame):
             "borrower": self.borrower_var.get(),
         })
 
-    def _create_full_document(self, output_path):
+    # ── saved orders ────────────────────────────────────────────
+    def save_session(self):
+        """Save the current order for the Recent Orders list; call on the Tk thread."""
+        if self._doc_job is not None:
+            return  # the form holds "Processing..." placeholders until the parse lands
+        self.sync_to_shared_data()
+        form = {
+            "search_doc": self.search_doc_var.get().strip(),
+            "output": self.output_path_var.get().strip(),
+            "status": self.process_status_var.get(),
+            "summary": self.title_summary_var.get(),
+        }
+        key = sessions.save(dict(self.shared_data.snapshot().values), form)
+        if key:
+            # Only a provisional doc: row is replaced, by the pin: row of the same order.
+            # Any other change of key is a different order, whose row stays.
+            previous = self._session_key
+            if previous and previous.startswith("doc:") and key.startswith("pin:"):
+                sessions.delete(previous)
+            self._session_key = key
+            self._refresh_recent()
+
+    def _pin_changed(self):
+        # Another parcel in the form is another order, not a rename of the saved one.
+        if self._session_key and self._session_key.startswith("pin:") \
+                and self._session_key != "pin:" + self.pin_var.get().strip():
+            self._session_key = None
+
+    def _refresh_recent(self):
+        self._recent = {}
+        for key, label, saved_at in sessions.recent():
+            stamp = time.strftime("%m/%d %H:%M", time.localtime(saved_at))
+            self._recent[f"{label}  ({stamp})"] = key
+        self.recent_combo["values"] = list(self._recent)
+
+    def open_recent(self):
+        key = self._recent.get(self.recent_var.get())
+        if key:
+            jobs.submit(sessions.load, key, category="session", on_done=self.restore_session)
+
+    def restore_session(self, state):
+        """Fill the tab and SharedData from a saved order; no parsing and no lookups."""
+        if not state:
+            return
+        if self._doc_job is not None:
+            self._doc_job.cancel()
+            self._doc_job = None
+        data, form = state["data"], state["form"]
+        self.shared_data.update_data({k: v for k, v in data.items() if k not in sessions.CHAIN_KEYS})
+        for key in sessions.CHAIN_KEYS:
+            self.shared_data.set_data(key, data.get(key, []))
+        for var, key, default in ((self.pin_var, "parcel_pin", ""), (self.address_var, "parcel_address", ""),
+                                  (self.owner_var, "parcel_owner", ""),
+                                  (self.city_var, "parcel_city_state_zip", ""),
+                                  (self.legal_desc_var, "parcel_legal_description", ""),
+                                  (self.tax_2024_total_var, "tax_2024_total", ""),
+                                  (self.tax_2024_paid_var, "tax_2024_paid_status", "PAID"),
+                                  (self.tax_2024_date_paid_var, "tax_2024_date_paid", ""),
+                                  (self.tax_2025_est_var, "tax_2025_estimated", ""),
+                                  (self.lender_var, "lender", ""), (self.borrower_var, "borrower", "")):
+            var.set(data.get(key) or default)
+        self._session_key = state["key"]  # after pin_var, whose trace would clear it
+        self._restoring = True
+        try:
+            self.search_doc_var.set(form.get("search_doc", ""))
+        finally:
+            self._restoring = False
+        self.output_path_var.set(form.get("output", ""))
+        self.process_status_var.set(form.get("status") or f"Reopened {state['label']}")
+        self.title_summary_var.set(form.get("summary") or
+                                   f"{len(data.get('title_chain_kept', []))} vesting deeds in chain.")
+        self.hide_progress()
+
+    def _order_snapshot(self):
+        """Copy the form and the kept chain into a snapshot; call on the Tk thread."""
+        return services.OrderSnapshot(
+            pin=self.pin_var.get(),
+            address=self.address_var.get(),
+            owner=self.owner_var.get(),
+            city=self.city_var.get(),
+            legal_desc=self.legal_desc_var.get(),
+            tax_2024_total=self.tax_2024_total_var.get(),
+            tax_2024_date_paid=self.tax_2024_date_paid_var.get(),
+            tax_2025_est=self.tax_2025_est_var.get(),
+            lender=self.lender_var.get(),
+            borrower=self.borrower_var.get(),
+            chain=tuple(self.shared_data.get_data("title_chain_kept") or ()),
+        )
+
+    def _create_full_document(self, output_path, order):
         """Create the final document with proper placeholder mapping."""
         template_path = self.get_template_path()
         if not template_path:
             return False, "Template file 'td_tmplt2.docx' not found."
-        
-        doc = Document(template_path)
-
-        def smart_title_case(text):
-            if not text or text.strip().isdigit() or '$' in text:
-                return text
-            preserve_upper = ['LLC', 'PLLC', 'INC', 'CO', 'CORP', 'LP', 'LLP', 'PA', 'PC', 'LTD', 'II', 'III', 'IV', 'JR', 'SR', 'MS', 'US']
-            words = text.split()
-            result = []
-            for word in words:
-                clean_word = word.strip('.,;:')
-                if clean_word.upper() in preserve_upper:
-                    result.append(clean_word.upper() + word[len(clean_word):])
-                else:
-                    result.append(word.capitalize())
-            return ' '.join(result)
-
-        values_map = {
-            "PARCEL": self.pin_var.get(),
-            "PROPSTRE": smart_title_case(self.address_var.get()),
-            "SLRLAST": smart_title_case(self.owner_var.get()),
-            "CITY_STATE_ZIP": smart_title_case(self.city_var.get()),
-            "LEGAL_DESC": smart_title_case(self.legal_desc_var.get()),
-            "TAXAMT": ("$" + self.tax_2024_total_var.get()) if self.tax_2024_total_var.get() else "",
-            "TAXDAT": self.tax_2024_date_paid_var.get(),
-            "TAX_2025_EST": ("$" + self.tax_2025_est_var.get()) if self.tax_2025_est_var.get() else "",
-            "Lender": smart_title_case(self.lender_var.get()),
-            "BYRLAST": smart_title_case(self.borrower_var.get()),
-            "LOAN_AMOUNT": "",
-        }
 
-        print("--- FORMAT-PRESERVING FIX: Values being mapped ---")
-        for key, value in values_map.items():
-            print(f"  - {{{key}}}: '{value}'")
-
-        # --- NEW, FORMAT-PRESERVING REPLACEMENT LOGIC ---
-        def replace_text_in_element(element, values):
-            if isinstance(element, Paragraph):
-                paragraphs = [element]
-            else:
-                paragraphs = element.paragraphs
-                
-            for p in paragraphs:
-                for key, value in values.items():
-                    placeholder = f"{{{key}}}"
-                    while True:
-                        full_text = "".join(run.text for run in p.runs)
-                        if placeholder not in full_text:
-                            break
-
-                        start_char_idx = full_text.find(placeholder)
-                        end_char_idx = start_char_idx + len(placeholder)
-
-                        char_count = 0
-                        start_run_info, end_run_info = None, None
-                        
-                        runs_to_process = list(p.runs)
-                        for i, run in enumerate(runs_to_process):
-                            run_len = len(run.text)
-                            if not start_run_info and start_char_idx < char_count + run_len:
-                                start_run_info = {'index': i, 'pos': start_char_idx - char_count}
-                            if not end_run_info and end_char_idx <= char_count + run_len:
-                                end_run_info = {'index': i, 'pos': end_char_idx - char_count}
-                                break
-                            char_count += run_len
-
-                        if start_run_info and end_run_info:
-                            start_idx = start_run_info['index']
-                            start_pos = start_run_info['pos']
-                            end_idx = end_run_info['index']
-                            end_pos = end_run_info['pos']
-                            
-                            start_run = runs_to_process[start_idx]
-                            
-                            if start_idx == end_idx:
-                                before = start_run.text[:start_pos]
-                                after = start_run.text[end_pos:]
-                                start_run.text = f"{before}{value}{after}"
-                            else:
-                                start_run.text = start_run.text[:start_pos] + str(value)
-                                for i in range(start_idx + 1, end_idx):
-                                    runs_to_process[i].text = ""
-                                end_run = runs_to_process[end_idx]
-                                end_run.text = end_run.text[end_pos:]
-
-        # Apply the replacement to all paragraphs and tables
-        for paragraph in doc.paragraphs:
-            replace_text_in_element(paragraph, values_map)
-
-        for table in doc.tables:
-            header_text = ' '.join([cell.text.upper() for cell in table.rows[0].cells])
-            if 'GRANTOR' in header_text and 'GRANTEE' in header_text:
-                continue
-
-            for row in table.rows:
-                for cell in row.cells:
-                    replace_text_in_element(cell, values_map)
-
-        # --- Fill Title Chain Table ---
-        chain_deeds = self.shared_data.get_data("title_chain_kept") or []
-        chain_table = None
-        for table in doc.tables:
-            header_text = ' '.join([cell.text.upper() for cell in table.rows[0].cells])
-            if 'GRANTOR' in header_text and 'GRANTEE' in header_text:
-                chain_table = table
-                break
-
-        if chain_table and chain_deeds:
-            while len(chain_table.rows) > 1:
-                chain_table._element.remove(chain_table.rows[-1]._element)
-            for deed in sorted(chain_deeds, key=lambda d: d.date):
-                row = chain_table.add_row().cells
-                row[0].text = deed.grantor
-                row[1].text = deed.grantee
-                row[2].text = deed.instrument
-                row[3].text = deed.date_string
-                row[4].text = deed.book_page
-            print(f"Added {len(chain_deeds)} deeds to the title chain table.")
-
-        doc.save(output_path)
+        # Timing and deed count go to the perf log as the "render" span.
+        services.render_document(order, template_path, output_path)
         return True, f"Document successfully generated at:\n{output_path}"
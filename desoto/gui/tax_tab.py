@@ -1,5 +1,6 @@
-import threading, tkinter as tk
+import tkinter as tk
 from tkinter import ttk, messagebox
+from desoto import jobs
 from desoto.services import fetch_total, DISTRICT_OPTIONS
 
 
@@ -81,8 +82,7 @@ class TaxTab(ttk.Frame):
 
         self.btn_calc.config(state="disabled")
         self.tax_result.set(f"Calculating on ${assessed_val} …")
-        threading.Thread(target=self._thread,
-                         args=(assessed_val, district), daemon=True).start()
+        jobs.submit(self._thread, assessed_val, district, category="tax")
 
     def _thread(self, val, district):
         try:
@@ -90,7 +90,7 @@ class TaxTab(ttk.Frame):
             msg = f"2025 EST: ${total}" if total else "Total not found."
         except Exception as e:
             msg = f"Lookup failed: {e}"
-        self.after(0, self._done, msg)
+        jobs.post(self._done, msg)
 
     def _done(self, msg):
         self.tax_result.set(msg)
@@ -98,23 +98,19 @@ class TaxTab(ttk.Frame):
         if "2025 EST: $" in msg:
             tax_amount = msg.replace("2025 EST: $", "")
             self.shared_data.set_data("tax_2025_estimated", tax_amount)
-            self.processing_tab.load_from_tabs()
 
     # ── Auto-sync handlers ──────────────────────────────────────
     def _bind_autosave(self):
-        # Bind variable traces to auto-update shared data and refresh Processing tab
+        # Bind variable traces to auto-update shared data; the Processing tab follows its keys
         def on_amount(*_):
             value = (self.tax_2024_var.get() or "").strip()
             self.shared_data.set_data("tax_2024_total", value)
-            self.processing_tab.load_from_tabs()
         def on_status(*_):
             value = (self.paid_2024_var.get() or "").strip()
             self.shared_data.set_data("tax_2024_paid_status", value)
-            self.processing_tab.load_from_tabs()
         def on_date_paid(*_):
             value = (self.date_paid_2024_var.get() or "").strip()
             self.shared_data.set_data("tax_2024_date_paid", value)
-            self.processing_tab.load_from_tabs()
 
         # Use trace_add if available; fallback to trace
         try:
@@ -0,0 +1,52 @@
+import time
+from tkinter import ttk
+from desoto import jobs, perf
+
+
+class TimingsTab(ttk.Frame):
+    """Per-stage timings of the most recent background jobs, newest first and expanded."""
+
+    def __init__(self, parent, log_path=None):
+        super().__init__(parent, padding=20)
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(1, weight=1)
+
+        log = f"Full history: {log_path}" if log_path else "The performance log is off."
+        ttk.Label(self, text=f"Last job timings. {log}").grid(row=0, column=0, columnspan=2,
+                                                               sticky="w", pady=(0, 10))
+
+        self.tree = ttk.Treeview(self, columns=("ms", "details"), selectmode="browse")
+        self.tree.heading("#0", text="Stage")
+        self.tree.heading("ms", text="ms")
+        self.tree.heading("details", text="Details")
+        self.tree.column("#0", width=320)
+        self.tree.column("ms", width=90, anchor="e")
+        self.tree.column("details", width=420)
+        vsb = ttk.Scrollbar(self, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=vsb.set)
+        self.tree.grid(row=1, column=0, sticky="nsew")
+        vsb.grid(row=1, column=1, sticky="ns")
+
+        for trace in reversed(perf.recent()):
+            self._add_trace(trace)
+        perf.add_listener(lambda trace: jobs.post(self._add_trace, trace))
+
+    def _add_trace(self, trace):
+        for iid in self.tree.get_children():
+            self.tree.item(iid, open=False)
+        stamp = time.strftime("%H:%M:%S", time.localtime(trace.started))
+        root = self._insert("", 0, trace, f"{stamp}  {trace.name}")
+        self.tree.item(root, open=True)
+        self.tree.see(root)
+        for iid in self.tree.get_children()[perf.HISTORY:]:
+            self.tree.delete(iid)
+
+    def _insert(self, parent, index, span, text=None):
+        details = ", ".join(f"{k}={v}" for k, v in span.fields.items())
+        if span.error:
+            details = f"FAILED ({span.error})" + (f", {details}" if details else "")
+        iid = self.tree.insert(parent, index, text=text or span.name,
+                               values=(f"{span.ms:.1f}", details), open=True)
+        for child in span.children:
+            self._insert(iid, "end", child)
+        return iid
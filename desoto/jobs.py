@@ -0,0 +1,278 @@
+"""Application-wide background jobs with Tk-safe result dispatch.
+
+Every tab submits work here instead of starting its own threads. Jobs run
+on a fixed pool of worker threads, at most CATEGORY_LIMITS[category] at a
+time per category, and INTERACTIVE work is picked before BACKGROUND work.
+Workers never touch Tk: results and progress updates go through post() onto
+one queue that a single after() poller drains on the Tk thread. The poller
+records how long each callback waited (see stats()). Each job runs as a
+perf trace, so spans opened by the work it calls are grouped under it.
+Callbacks posted after the window is destroyed are dropped; scripts without
+a window call run_inline() so they run on the posting thread instead.
+
+    job = jobs.submit(fetch_total, value, district, category="tax",
+                      on_done=self._done, on_error=self._failed)
+    job.cancel()
+
+Jobs submitted with a key coalesce: while one with that key is queued or
+running, a later submit attaches its callbacks to it and returns the same
+job instead of starting the work again.
+"""
+import heapq
+import itertools
+import queue
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from concurrent.futures import Future
+
+from desoto import perf
+
+INTERACTIVE = 0   # the user is waiting on it: autocomplete, detail, generate
+BACKGROUND = 10   # bulk lookups and other work that can wait its turn
+
+CATEGORY_LIMITS = {"parcel": 4, "tax": 2, "document": 2}
+DEFAULT_LIMIT = 2
+WORKERS = 8
+POLL_MS = 15          # poller interval when the queue is idle
+DRAIN_BUDGET = 0.03   # seconds of callbacks per poll before yielding to Tk
+SAMPLES = 500         # latency samples kept for stats()
+
+
+class Job(Future):
+    """A Future with its category, priority and timings."""
+
+    def __init__(self, fn, args, kwargs, category, priority, key=None):
+        super().__init__()
+        self.fn, self.args, self.kwargs = fn, args, kwargs
+        self.category = category
+        self.priority = priority
+        self.key = key
+        self.on_done = []
+        self.on_error = []
+        self.discarded = False
+        self.submitted_at = time.perf_counter()
+        self.started_at = None
+        self.finished_at = None
+
+    def cancel(self):
+        """Cancel if still queued. A running job finishes, but its callbacks are dropped."""
+        self.discarded = True
+        return super().cancel()
+
+    def _attach(self, on_done, on_error):
+        # The same bound method twice would update the UI twice.
+        if on_done and on_done not in self.on_done:
+            self.on_done.append(on_done)
+        if on_error and on_error not in self.on_error:
+            self.on_error.append(on_error)
+
+
+def _percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+
+class JobExecutor:
+    def __init__(self, limits=None, workers=WORKERS, inline=False):
+        self.inline = inline  # headless: post() runs callbacks on the calling thread
+        self.limits = dict(CATEGORY_LIMITS, **(limits or {}))
+        self.workers = workers
+        self._cond = threading.Condition()
+        self._pending = []  # heap of (priority, seq, job)
+        self._running = Counter()
+        self._inflight = {}  # key -> queued or running Job
+        self._seq = itertools.count()
+        self._threads = []
+        self._ui = queue.SimpleQueue()
+        self._widget = None
+        self._closed = False  # the attached window is gone
+        self._dispatch = deque(maxlen=SAMPLES)  # post() -> callback on the Tk thread
+        self._waits = deque(maxlen=SAMPLES)     # submit -> start on a worker
+
+    # ── submission ──────────────────────────────────────────────
+    def submit(self, fn, *args, category="default", priority=INTERACTIVE,
+               on_done=None, on_error=None, key=None, **kwargs) -> Job:
+        """Queue fn(*args, **kwargs); on_done(result) / on_error(exc) run on the Tk thread."""
+        with self._cond:
+            job = self._inflight.get(key) if key is not None else None
+            if job is not None and not job.cancelled():
+                job.discarded = False  # wanted again, even if an earlier caller gave up on it
+                job._attach(on_done, on_error)
+                return job
+            job = Job(fn, args, kwargs, category, priority, key)
+            job._attach(on_done, on_error)
+            if key is not None:
+                self._inflight[key] = job
+            heapq.heappush(self._pending, (priority, next(self._seq), job))
+            while len(self._threads) < self.workers:
+                t = threading.Thread(target=self._work, name=f"job-{len(self._threads)}", daemon=True)
+                self._threads.append(t)
+                t.start()
+            self._cond.notify()
+        return job
+
+    def post(self, fn, *args):
+        """Run fn(*args) on the Tk thread; inline when headless, dropped once the window is gone."""
+        if self.inline:
+            fn(*args)
+        elif not self._closed:
+            self._ui.put((time.perf_counter(), fn, args))  # held until attach() if not yet attached
+
+    # ── workers ─────────────────────────────────────────────────
+    def _take(self):
+        """Best queued job whose category has a free slot; call with the lock held."""
+        blocked, job = [], None
+        while self._pending:
+            item = heapq.heappop(self._pending)
+            if item[2].cancelled():
+                self._forget(item[2])
+                continue
+            if self._running[item[2].category] < self.limits.get(item[2].category, DEFAULT_LIMIT):
+                job = item[2]
+                break
+            blocked.append(item)
+        for item in blocked:
+            heapq.heappush(self._pending, item)
+        return job
+
+    def _forget(self, job):
+        if job.key is not None and self._inflight.get(job.key) is job:
+            del self._inflight[job.key]
+
+    def _work(self):
+        while True:
+            with self._cond:
+                job = self._take()
+                while job is None:
+                    self._cond.wait()
+                    job = self._take()
+                self._running[job.category] += 1
+            try:
+                self._run(job)
+            finally:
+                with self._cond:
+                    self._running[job.category] -= 1
+                    self._cond.notify_all()
+
+    def _run(self, job):
+        if not job.set_running_or_notify_cancel():
+            return
+        job.started_at = time.perf_counter()
+        self._waits.append(job.started_at - job.submitted_at)
+        name = getattr(job.fn, "__qualname__", None) or repr(job.fn)
+        try:
+            with perf.span(name, category=job.category,
+                           wait_ms=round((job.started_at - job.submitted_at) * 1000, 2)):
+                result, error = job.fn(*job.args, **job.kwargs), None
+        except BaseException as e:
+            result, error = None, e
+        job.finished_at = time.perf_counter()
+        with self._cond:
+            # From here on a submit with the same key starts fresh work.
+            self._forget(job)
+            callbacks = [] if job.discarded else list(job.on_error if error else job.on_done)
+        if error is None:
+            job.set_result(result)
+            for callback in callbacks:
+                self.post(callback, result)
+            return
+        job.set_exception(error)
+        if job.discarded:
+            return
+        for callback in callbacks:
+            self.post(callback, error)
+        if not callbacks:
+            traceback.print_exception(type(error), error, error.__traceback__)
+
+    # ── Tk side ─────────────────────────────────────────────────
+    def attach(self, widget, poll_ms=POLL_MS):
+        """Start draining posted callbacks on widget's Tk thread."""
+        self._widget = widget
+        self._closed = False
+        self.poll_ms = poll_ms
+        widget.bind("<Destroy>", lambda e: self._close() if e.widget is widget else None, add="+")
+        widget.after(poll_ms, self._drain)
+
+    def _close(self):
+        """The window is gone: nothing may touch Tk now, so drop what is queued."""
+        self._widget, self._closed = None, True
+        while True:
+            try:
+                self._ui.get_nowait()
+            except queue.Empty:
+                break
+
+    def _drain(self):
+        deadline = time.perf_counter() + DRAIN_BUDGET
+        more = False
+        while True:
+            try:
+                queued_at, fn, args = self._ui.get_nowait()
+            except queue.Empty:
+                break
+            self._dispatch.append(time.perf_counter() - queued_at)
+            try:
+                fn(*args)
+            except Exception:
+                traceback.print_exc()
+            if time.perf_counter() > deadline:
+                more = True  # let Tk handle input before the rest
+                break
+        try:
+            self._widget.after(1 if more else self.poll_ms, self._drain)
+        except Exception:
+            self._close()  # window destroyed
+
+    def stats(self) -> dict:
+        """Queue depth, running jobs and latency percentiles in milliseconds."""
+        with self._cond:
+            queued = Counter(item[2].category for item in self._pending if not item[2].cancelled())
+            running = {k: v for k, v in self._running.items() if v}
+        dispatch = [s * 1000 for s in self._dispatch]
+        waits = [s * 1000 for s in self._waits]
+        return {
+            "queued": dict(queued),
+            "running": running,
+            "ui_backlog": self._ui.qsize(),
+            "dispatch_ms": {"p50": _percentile(dispatch, 50), "p95": _percentile(dispatch, 95),
+                            "max": max(dispatch, default=0.0)},
+            "wait_ms": {"p50": _percentile(waits, 50), "p95": _percentile(waits, 95),
+                        "max": max(waits, default=0.0)},
+        }
+
+
+_lock = threading.Lock()
+_executor = None
+
+
+def default() -> JobExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = JobExecutor()
+        return _executor
+
+
+def submit(fn, *args, **kwargs) -> Job:
+    return default().submit(fn, *args, **kwargs)
+
+
+def post(fn, *args):
+    default().post(fn, *args)
+
+
+def attach(widget, poll_ms=POLL_MS):
+    default().attach(widget, poll_ms)
+
+
+def run_inline():
+    """Run posted callbacks on the posting thread, for processes without a Tk window."""
+    default().inline = True
+
+
+def stats() -> dict:
+    return default().stats()
@@ -0,0 +1,158 @@
+"""Timing spans for the processing pipeline, logged as JSON lines.
+
+    with perf.span("table-extract") as s:
+        entries = extract_table_entries_from_pdf(stream)
+        s.set(entries=len(entries))
+
+A span opened inside another one on the same thread becomes its child. The
+outermost span is a trace; every background job runs as one (see jobs.py),
+so a document parse is recorded as the job with classify, split,
+table-extract and the rest underneath it. When a trace ends it joins
+recent() and is passed to the trace listeners (the Timings tab).
+
+Spans cost two perf_counter calls and are only written to disk after
+configure(), which the app and the API server call. Each finished span is
+one JSON line in ~/.desoto/perf.log (or DESOTO_PERF_LOG), which rotates at
+LOG_BYTES and keeps LOG_BACKUPS old files. warn() records a failure the
+pipeline recovered from (a PDF extractor falling back, say) on the current
+span, so it lands in the same line and in the Timings tab.
+"""
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+import traceback
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from logging.handlers import RotatingFileHandler
+
+LOG_PATH = os.environ.get(
+    "DESOTO_PERF_LOG",
+    os.path.join(os.path.expanduser("~"), ".desoto", "perf.log"),
+)
+LOG_BYTES = 2 * 2 ** 20
+LOG_BACKUPS = 3
+HISTORY = 25   # finished traces kept for recent()
+
+_local = threading.local()
+_lock = threading.Lock()
+_traces = deque(maxlen=HISTORY)
+_listeners = []
+_ids = itertools.count(1)
+_logger = None
+
+
+@dataclass
+class Span:
+    name: str
+    fields: dict
+    trace: int
+    parent: str | None = None
+    started: float = 0.0   # wall clock, for the log
+    ms: float = 0.0
+    error: str | None = None
+    children: list = field(default_factory=list)
+
+    def set(self, **fields):
+        """Attach counts or other details to the span."""
+        self.fields.update(fields)
+
+    def record(self) -> dict:
+        row = {"ts": round(self.started, 3), "trace": self.trace, "span": self.name,
+               "ms": round(self.ms, 2)}
+        if self.parent:
+            row["parent"] = self.parent
+        if self.error:
+            row["error"] = self.error
+        row.update(self.fields)
+        return row
+
+
+@contextmanager
+def span(name, **fields):
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    parent = stack[-1] if stack else None
+    s = Span(name, fields, parent.trace if parent else next(_ids),
+             parent.name if parent else None, time.time())
+    stack.append(s)
+    started = time.perf_counter()
+    try:
+        yield s
+    except BaseException as e:
+        s.error = type(e).__name__
+        raise
+    finally:
+        s.ms = (time.perf_counter() - started) * 1000
+        stack.pop()
+        if parent is not None:
+            parent.children.append(s)
+        _finish(s, parent is None)
+
+
+def _finish(s, is_trace):
+    if _logger is not None:
+        _logger.info(json.dumps(s.record(), default=str))
+    if not is_trace:
+        return
+    with _lock:
+        _traces.append(s)
+        listeners = list(_listeners)
+    for listener in listeners:
+        try:
+            listener(s)
+        except Exception:
+            traceback.print_exc()
+
+
+def warn(message):
+    """Note a recovered failure on the current span, or log it as its own line outside one."""
+    stack = getattr(_local, "stack", None)
+    if stack:
+        stack[-1].fields.setdefault("warnings", []).append(message)
+        return
+    row = {"ts": round(time.time(), 3), "warning": message}
+    # Before configure() the logging module's last-resort handler prints it to stderr.
+    logging.getLogger("desoto.perf").warning(json.dumps(row, default=str))
+
+
+def recent() -> list[Span]:
+    """Finished traces, newest first."""
+    with _lock:
+        return list(reversed(_traces))
+
+
+def add_listener(callback):
+    """Call callback(trace) on the finishing thread as each trace ends; returns a remover."""
+    with _lock:
+        _listeners.append(callback)
+
+    def remove():
+        with _lock:
+            if callback in _listeners:
+                _listeners.remove(callback)
+    return remove
+
+
+def configure(path=LOG_PATH):
+    """Start writing spans to the rotating log at path; returns the path, or None if it can't be opened."""
+    global _logger
+    logger = logging.getLogger("desoto.perf")
+    if not logger.handlers:
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            handler = RotatingFileHandler(path, maxBytes=LOG_BYTES, backupCount=LOG_BACKUPS,
+                                          encoding="utf-8", delay=True)
+        except OSError as e:
+            print(f"Performance log disabled: {e}")
+            return None
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    _logger = logger
+    return path
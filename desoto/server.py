@@ -0,0 +1,410 @@
+"""Local HTTP/JSON API over the parcel, tax and document services.
+
+    python -m desoto.server [--port 8766] [--workers 8] [--queue 32] [--work-dir DIR]
+
+Lets other programs (the intake system) use what the Tk app does:
+
+  GET  /parcels?q=123+MAIN&limit=10   address autocomplete (parcels.query)
+  GET  /parcels/<pin>                 full parcel record
+  GET  /tax?value=150000&district=County
+                                      primary-residence estimate (tax.fetch_total)
+  POST /documents/process             {"path": "search.pdf"} or the PDF itself
+                                      (Content-Type: application/pdf);
+                                      chain, tax total and date paid
+  POST /documents/render              one order as in a desoto.generate manifest;
+                                      writes it to "output" when given,
+                                      otherwise returns the .docx
+  GET  /metrics                       request counts and latency percentiles
+  GET  /health
+
+The process stays up, so the PDF and docx libraries, the compiled template
+plan, the parcel caches and the keep-alive HTTP sessions are loaded once and
+reused by every request. Requests run on a fixed pool of worker threads; when
+all workers are busy and the queue is full, new connections get HTTP 503
+straight away. It binds to localhost and has no authentication.
+
+Because any local program (or web page) can reach it, the files a request
+names ("path", "source_pdf", "output") are resolved inside the work
+directory (~/.desoto/work, DESOTO_WORK_DIR or --work-dir); a request whose
+path resolves outside it gets HTTP 403.
+"""
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from desoto import jobs, perf, startup
+from desoto.generate import TEMPLATE, generate_one
+
+WORK_DIR = os.environ.get(
+    "DESOTO_WORK_DIR",
+    os.path.join(os.path.expanduser("~"), ".desoto", "work"),
+)
+WORKERS = 8
+QUEUE = 32               # connections accepted while all workers are busy
+MAX_BODY = 50 * 2 ** 20  # bytes; search packages are a few MB
+SAMPLES = 1000           # latency samples kept per route
+DOCX_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+
+class Metrics:
+    """Per-route request counts and recent latencies."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.requests = Counter()
+        self.errors = Counter()      # 5xx answers
+        self.rejected = 0            # turned away with 503 before reaching a worker
+        self.in_flight = 0
+        self._latency = {}           # route -> deque of seconds
+
+    def begin(self):
+        with self._lock:
+            self.in_flight += 1
+
+    def record(self, route, status, seconds):
+        with self._lock:
+            self.in_flight -= 1
+            self.requests[route] += 1
+            if status >= 500:
+                self.errors[route] += 1
+            self._latency.setdefault(route, deque(maxlen=SAMPLES)).append(seconds)
+
+    def reject(self):
+        with self._lock:
+            self.rejected += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            routes = {}
+            for route, samples in sorted(self._latency.items()):
+                ms = [s * 1000 for s in samples]
+                routes[route] = {
+                    "requests": self.requests[route], "errors": self.errors[route],
+                    "p50_ms": _percentile(ms, 50), "p95_ms": _percentile(ms, 95),
+                    "p99_ms": _percentile(ms, 99), "max_ms": max(ms, default=0.0),
+                }
+            return {"uptime_s": round(time.time() - self.started, 1), "in_flight": self.in_flight,
+                    "rejected": self.rejected, "routes": routes}
+
+
+# ── handlers ──────────────────────────────────────────────────
+def confine(path, work_dir, name="path"):
+    """path resolved against work_dir (symlinks included); ApiError unless it stays inside."""
+    if not isinstance(path, str) or not path.strip():
+        raise ApiError(400, f"'{name}' must be a file name")
+    full = os.path.realpath(os.path.join(work_dir, path))
+    root = os.path.normcase(work_dir)
+    try:
+        inside = os.path.commonpath([os.path.normcase(full), root]) == root
+    except ValueError:  # another drive
+        inside = False
+    if not inside or os.path.normcase(full) == root:
+        raise ApiError(403, f"'{name}' must be inside the work directory")
+    return full
+
+
+def _chain_rows(entries):
+    # Same row shape desoto.generate reads, so a process result can be rendered as-is.
+    return [{"date": e.date_string, "grantor": e.grantor, "grantee": e.grantee,
+             "instrument": e.instrument, "book_page": e.book_page, "vesting": e.is_vesting}
+            for e in entries]
+
+
+def parcels_query(params):
+    from desoto.services import parcels
+    q = params.get("q", "").strip()
+    if not q:
+        raise ApiError(400, "'q' is required")
+    try:
+        limit = int(params.get("limit", 10))
+    except ValueError:
+        raise ApiError(400, "'limit' must be a number") from None
+    return {"rows": parcels.query(q, max(1, min(limit, 100)))}
+
+
+def parcel_detail(pin):
+    from desoto.services import parcels
+    record = parcels.detail(pin)
+    if record is None:
+        raise ApiError(404, f"No parcel with PIN {pin}")
+    return record
+
+
+def tax_total(params):
+    from desoto.services import tax
+    value = params.get("value", "").replace("$", "").replace(",", "").strip()
+    district = params.get("district", tax.DISTRICT_OPTIONS[0])
+    if not value.replace(".", "", 1).isdigit():
+        raise ApiError(400, "'value' must be an appraised value")
+    if district not in tax.DISTRICT_MAP:
+        raise ApiError(400, f"'district' must be one of {', '.join(tax.DISTRICT_OPTIONS)}")
+    try:
+        total = tax.fetch_total(value, district)
+    except Exception as e:
+        raise ApiError(502, f"Tax estimator failed: {e}") from None
+    return {"value": value, "district": district, "total": total}
+
+
+def process_document(path):
+    from desoto.services.document_splitter import process_comprehensive_document
+    if not os.path.isfile(path):
+        raise ApiError(400, f"No such file: {path}")
+    ok, msg, results = process_comprehensive_document(path)
+    return {
+        "ok": ok, "message": msg, "status": results.get("status", ""),
+        "tax_total": results.get("tax_total"), "tax_date_paid": results.get("tax_date_paid"),
+        "chain": _chain_rows(results.get("chain_entries", [])),
+        "all_entries": _chain_rows(results.get("all_entries", [])),
+    }
+
+
+def render_order(order, template, work_dir):
+    """(json, None) when the order names an output file, else (None, docx bytes).
+
+    source_pdf and output are file names in work_dir.
+    """
+    if not isinstance(order, dict):
+        raise ApiError(400, "Expected one order object")
+    if order.get("source_pdf"):
+        order = dict(order, source_pdf=confine(order["source_pdf"], work_dir, "source_pdf"))
+    output = order.get("output")
+    try:
+        if output:
+            if not isinstance(output, str):
+                raise ApiError(400, "'output' must be a file name")
+            output = confine(output if output.lower().endswith(".docx") else output + ".docx",
+                             work_dir, "output")
+            timings = generate_one(order, template, output)
+            return {"path": output, "render_ms": round(timings["render"] * 1000, 1),
+                    "deeds": timings["deeds"]}, None
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "order.docx")
+            generate_one(order, template, path)
+            with open(path, "rb") as f:
+                return None, f.read()
+    except ValueError as e:
+        raise ApiError(400, str(e)) from None
+
+
+# ── server ────────────────────────────────────────────────────
+class DesotoServer(HTTPServer):
+    """HTTPServer whose connections are handled on a bounded worker pool."""
+
+    def __init__(self, address, workers=WORKERS, queue=QUEUE, template=TEMPLATE, work_dir=WORK_DIR):
+        super().__init__(address, _Handler)
+        self.template = template
+        os.makedirs(work_dir, exist_ok=True)
+        self.work_dir = os.path.realpath(work_dir)
+        self.metrics = Metrics()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="api")
+        self._slots = threading.BoundedSemaphore(workers + queue)
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def warm(self):
+        """Load the parsers, compile the template and build the address index before the first request."""
+        from desoto.services import address_index, docx_template
+        timings = startup.preload()
+        started = time.perf_counter()
+        docx_template.get_plan(self.template)
+        timings["template"] = time.perf_counter() - started
+        started = time.perf_counter()
+        address_index.build()
+        timings["address-index"] = time.perf_counter() - started
+        return timings
+
+    def process_request(self, request, client_address):
+        if not self._slots.acquire(blocking=False):
+            self.metrics.reject()
+            try:
+                request.sendall(b"HTTP/1.0 503 Service Unavailable\r\n"
+                                b"Content-Length: 0\r\nRetry-After: 1\r\n\r\n")
+            except OSError:
+                pass
+            self.shutdown_request(request)
+            return
+        self._pool.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self._slots.release()
+
+    def server_close(self):
+        super().server_close()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+ROUTES = {"GET /health", "GET /metrics", "GET /parcels", "GET /parcels/<pin>", "GET /tax",
+          "POST /documents/process", "POST /documents/render"}
+
+
+def _route_name(method, path):
+    # Metrics are kept per route, not per URL, so PINs and typos don't add keys.
+    if method == "GET" and path.startswith("/parcels/"):
+        return "GET /parcels/<pin>"
+    route = f"{method} {path}"
+    return route if route in ROUTES else "unknown"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # HTTP/1.0: one request per connection, so idle keep-alives never hold a worker.
+    server: DesotoServer
+
+    def log_message(self, *_):
+        pass
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def _handle(self, method):
+        started = time.perf_counter()
+        self.server.metrics.begin()
+        url = urlsplit(self.path)
+        path = url.path.rstrip("/") or "/"
+        route = _route_name(method, path)
+        status = 500
+        try:
+            with perf.span(route):  # one trace per request, with the pipeline stages under it
+                status, content_type, body = self._dispatch(route, path, url.query)
+        except ApiError as e:
+            status, content_type, body = e.status, "application/json", json.dumps({"error": str(e)})
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            status, content_type, body = 500, "application/json", json.dumps({"error": str(e)})
+        finally:
+            self.server.metrics.record(route, status, time.perf_counter() - started)
+        self._send(status, content_type, body)
+
+    def _dispatch(self, route, path, query):
+        """(status, content type, body) for one request."""
+        params = {k: v[-1] for k, v in parse_qs(query).items()}
+        if route == "GET /health":
+            result = {"ok": True}
+        elif route == "GET /metrics":
+            result = self.server.metrics.snapshot()
+        elif route == "GET /parcels":
+            result = parcels_query(params)
+        elif route == "GET /parcels/<pin>":
+            result = parcel_detail(path[len("/parcels/"):])
+        elif route == "GET /tax":
+            result = tax_total(params)
+        elif route == "POST /documents/process":
+            result = self._process_document()
+        elif route == "POST /documents/render":
+            result, docx = render_order(self._json(), self.server.template, self.server.work_dir)
+            if docx is not None:
+                return 200, DOCX_TYPE, docx
+        else:
+            raise ApiError(404, f"No route for {self.command} {path}")
+        return 200, "application/json", json.dumps(result)
+
+    def _body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY:
+            raise ApiError(413, f"Request body over {MAX_BODY // 2 ** 20} MB")
+        return self.rfile.read(length)
+
+    def _json(self):
+        try:
+            return json.loads(self._body() or b"{}")
+        except ValueError:
+            raise ApiError(400, "Request body is not valid JSON") from None
+
+    def _process_document(self):
+        if self.headers.get("Content-Type", "").split(";")[0].strip() != "application/pdf":
+            path = self._json().get("path")
+            if not path:
+                raise ApiError(400, "Send {\"path\": ...} or the PDF as application/pdf")
+            return process_document(confine(path, self.server.work_dir))
+        fd, tmp = tempfile.mkstemp(suffix=".pdf")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(self._body())
+            return process_document(tmp)
+        finally:
+            os.remove(tmp)
+
+    def _send(self, status, content_type, body):
+        data = body if isinstance(body, bytes) else body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def serve(host="127.0.0.1", port=0, workers=WORKERS, queue=QUEUE, template=TEMPLATE,
+          work_dir=WORK_DIR) -> DesotoServer:
+    """Start a warmed-up server on a background thread and return it.
+
+    Puts desoto.jobs in headless mode: the embedding process has no Tk poller.
+    """
+    jobs.run_inline()
+    server = DesotoServer((host, port), workers, queue, template, work_dir)
+    server.warm()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8766)
+    ap.add_argument("--workers", type=int, default=WORKERS, help="requests handled at once")
+    ap.add_argument("--queue", type=int, default=QUEUE, help="connections waiting before 503s")
+    ap.add_argument("--template", default=TEMPLATE)
+    ap.add_argument("--work-dir", default=WORK_DIR, help="the only directory requests may read or write")
+    args = ap.parse_args(argv)
+
+    jobs.run_inline()  # no Tk window in this process, as in serve()
+    server = DesotoServer((args.host, args.port), args.workers, args.queue,
+                          os.path.abspath(args.template), args.work_dir)
+    log_path = perf.configure()
+    timings = server.warm()
+    print(f"Warmed up in {sum(timings.values()) * 1000:.0f} ms")
+    print(f"DeSoto API on {server.base_url} with {args.workers} workers, files in {server.work_dir}")
+    if log_path:
+        print(f"Stage timings are logged to {log_path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
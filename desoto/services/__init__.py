@@ -1,4 +1,43 @@
-from .parcels import query as query_parcels
-from .tax import fetch_total, DISTRICT_OPTIONS
-from .tax_document import process_tax_document, extract_tax_info_from_pdf, parse_tax_text
-from .document_splitter import process_comprehensive_document     
\ No newline at end of file
+"""Service functions re-exported for the GUI.
+
+Each name is imported from its module on first access, so importing the
+package (or a light module such as tax) doesn't load requests, PyPDF2 or
+python-docx before the window is up. desoto.startup.warm_up() loads the
+heavy ones in the background once it is.
+"""
+import importlib
+
+_EXPORTS = {
+    "query_parcels": ("parcels", "query"),
+    "suggest_parcels": ("parcels", "suggest"),
+    "parcel_detail": ("parcels", "detail"),
+    "resolve_parcels": ("parcels", "resolve_many"),
+    "iter_parcel_search": ("parcels", "iter_search"),
+    "fetch_total": ("tax", "fetch_total"),
+    "fetch_estimate": ("tax", "fetch_estimate"),
+    "parse_estimate": ("tax", "parse_estimate"),
+    "DISTRICT_OPTIONS": ("tax", "DISTRICT_OPTIONS"),
+    "process_tax_document": ("tax_document", "process_tax_document"),
+    "extract_tax_info_from_pdf": ("tax_document", "extract_tax_info_from_pdf"),
+    "parse_tax_text": ("tax_document", "parse_tax_text"),
+    "process_comprehensive_document": ("document_splitter", "process_comprehensive_document"),
+    "OrderSnapshot": ("document_render", "OrderSnapshot"),
+    "render_document": ("document_render", "render_document"),
+    "template_values": ("document_render", "template_values"),
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    try:
+        module, attr = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(f"{__name__}.{module}"), attr)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,205 @@
+"""Forgiving address lookup over the local parcel index.
+
+Normalizes street suffixes, directionals and unit designators ("123 Main
+Street" -> "123 MAIN ST"), then answers from a sorted array of normalized
+addresses (prefix) and a trigram index re-ranked by edit distance
+("123 Mian St" -> "123 MAIN ST"). Built in memory from parcel_index in the
+background, by warm() at startup and again whenever get() sees the index
+file change (after a sync or build). Builds run on a daemon thread unless
+the app routes them through its own scheduler (set_scheduler). Until the
+first build finishes, lookups return nothing and callers fall through to
+the next tier; during a rebuild the previous index keeps answering.
+"""
+import bisect
+import os
+import re
+import threading
+from collections import Counter
+
+from desoto.services import parcel_index
+
+SUFFIXES = {
+    "ALLEY": "ALY", "AVENUE": "AVE", "AV": "AVE", "BEND": "BND", "BOULEVARD": "BLVD",
+    "BRANCH": "BR", "CIRCLE": "CIR", "COURT": "CT", "COVE": "CV", "CREEK": "CRK",
+    "CROSSING": "XING", "DRIVE": "DR", "EXTENSION": "EXT", "HIGHWAY": "HWY",
+    "HOLLOW": "HOLW", "LANE": "LN", "LOOP": "LOOP", "PARKWAY": "PKWY", "PLACE": "PL",
+    "POINT": "PT", "RIDGE": "RDG", "ROAD": "RD", "SQUARE": "SQ", "STREET": "ST",
+    "TERRACE": "TER", "TRACE": "TRCE", "TRAIL": "TRL", "WAY": "WAY",
+}
+DIRECTIONALS = {
+    "NORTH": "N", "SOUTH": "S", "EAST": "E", "WEST": "W",
+    "NORTHEAST": "NE", "NORTHWEST": "NW", "SOUTHEAST": "SE", "SOUTHWEST": "SW",
+}
+UNITS = {"APARTMENT", "APT", "UNIT", "SUITE", "STE", "BLDG", "BUILDING", "#"}
+
+_WORD_RE = re.compile(r"#|[A-Z0-9]+")
+COMMON_GRAM_SHARE = 0.05   # trigrams in more than this share of addresses are skipped
+RERANK_CANDIDATES = 100    # trigram candidates checked by edit distance
+
+
+def normalize(text: str) -> str:
+    """Canonical USPS-style form used for both indexing and lookups."""
+    words = _WORD_RE.findall((text or "").upper())
+    out = []
+    for i, w in enumerate(words):
+        if w in UNITS and i > 0:
+            out.append("#")
+            continue
+        nxt = words[i + 1] if i + 1 < len(words) else None
+        # Only the street's last word is a suffix: "HACKS CROSSING RD" keeps CROSSING.
+        if nxt is None or nxt in UNITS or nxt in DIRECTIONALS or nxt in DIRECTIONALS.values():
+            w = SUFFIXES.get(w, w)
+        out.append(DIRECTIONALS.get(w, w))
+    return " ".join(out)
+
+
+def _grams(text: str) -> set:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def prefix_distance(query: str, target: str) -> int:
+    """Edit distance from query to the closest prefix of target."""
+    prev = list(range(len(target) + 1))
+    for i, qc in enumerate(query, 1):
+        cur = [i]
+        for j, tc in enumerate(target, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (qc != tc)))
+        prev = cur
+    return min(prev)
+
+
+class AddressIndex:
+    def __init__(self, entries):
+        """entries: iterable of (OBJECTID, FULL_ADDR)."""
+        pairs = sorted((normalize(addr), oid) for oid, addr in entries if addr)
+        self.keys = [k for k, _ in pairs]
+        self.ids = [oid for _, oid in pairs]
+        postings = {}
+        for pos, key in enumerate(self.keys):
+            for g in _grams(key):
+                postings.setdefault(g, []).append(pos)
+        self.postings = postings
+        self.common = max(50, int(len(self.keys) * COMMON_GRAM_SHARE))
+
+    def __len__(self):
+        return len(self.keys)
+
+    def prefix(self, key: str, limit: int) -> list[int]:
+        start = bisect.bisect_left(self.keys, key)
+        end = bisect.bisect_left(self.keys, key + "\uffff", lo=start)
+        return list(range(start, min(end, start + limit)))
+
+    def fuzzy(self, key: str, limit: int) -> list[int]:
+        grams = _grams(key)
+        lists = [self.postings[g] for g in grams if g in self.postings]
+        rare = [p for p in lists if len(p) <= self.common] or lists
+        counts = Counter()
+        for plist in rare:
+            counts.update(plist)
+        allowed = max(1, len(key) // 4)
+        scored = []
+        for pos, shared in counts.most_common(RERANK_CANDIDATES):
+            target = self.keys[pos]
+            dist = prefix_distance(key, target[:len(key) + allowed])
+            if dist <= allowed:
+                scored.append((dist, -shared, target, pos))
+        scored.sort()
+        return [pos for *_, pos in scored[:limit]]
+
+    def search(self, text: str, limit: int = 10, fuzzy: bool = True) -> list[tuple[int, str]]:
+        """Ranked (OBJECTID, normalized address) candidates for free-form input.
+
+        With fuzzy=False only normalized prefix matches are returned, no
+        edit-distance near-misses.
+        """
+        key = normalize(text)
+        if not key:
+            return []
+        hits = self.prefix(key, limit) or (fuzzy and self.fuzzy(key, limit))
+        if not hits and " #" in key:
+            # Parcel addresses rarely carry units; retry on the street address alone.
+            street = key.split(" #", 1)[0]
+            hits = self.prefix(street, limit) or (fuzzy and self.fuzzy(street, limit))
+        return [(self.ids[pos], self.keys[pos]) for pos in hits or ()]
+
+
+_lock = threading.Lock()
+_loaded = {}  # index path -> (mtime_ns, AddressIndex)
+_building = set()  # index paths with a build scheduled or running
+
+
+def _in_thread(fn, *args):
+    threading.Thread(target=fn, args=args, name="address-index", daemon=True).start()
+
+
+_schedule = _in_thread
+
+
+def set_scheduler(schedule):
+    """Run background builds as schedule(fn, *args) instead of on a new thread."""
+    global _schedule
+    _schedule = schedule or _in_thread
+
+
+def build(path: str = None):
+    """Build the AddressIndex for path now and make it current; None if there is no index."""
+    path = path or parcel_index.INDEX_PATH
+    try:
+        stamp = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    index = AddressIndex(parcel_index.addresses(path))
+    with _lock:
+        _loaded[path] = (stamp, index)
+    return index
+
+
+def warm(path: str = None):
+    """Build the index in the background; a call while a build is pending is a no-op."""
+    path = path or parcel_index.INDEX_PATH
+    with _lock:
+        if path in _building:
+            return
+        _building.add(path)
+    try:
+        _schedule(_build_scheduled, path)
+    except BaseException:
+        with _lock:
+            _building.discard(path)
+        raise
+
+
+def _build_scheduled(path):
+    try:
+        build(path)
+    finally:
+        with _lock:
+            _building.discard(path)
+
+
+def get(path: str = None):
+    """The ready AddressIndex for the local parcel index, or None while there is none.
+
+    Never builds on the calling thread: a missing or outdated index starts
+    warm() and the caller gets the previous index, if any.
+    """
+    path = path or parcel_index.INDEX_PATH
+    try:
+        stamp = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    with _lock:
+        cached = _loaded.get(path)
+    if cached is None or cached[0] != stamp:
+        warm(path)
+    return cached[1] if cached else None
+
+
+def search(text: str, limit: int = 10, path: str = None, fuzzy: bool = True) -> list[dict]:
+    """Parcel rows for misspelled or abbreviated addresses, best match first."""
+    index = get(path)
+    if index is None:
+        return []
+    ids = [oid for oid, _ in index.search(text, limit, fuzzy)]
+    return parcel_index.rows_by_ids(ids, path)
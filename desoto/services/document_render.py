@@ -0,0 +1,84 @@
+"""Title document rendering from a plain data snapshot, independent of the GUI.
+
+The Processing tab, the batch generator and scripts all build an
+OrderSnapshot and hand it to render_document, so the template is filled
+the same way everywhere and nothing here touches Tk. Snapshots are frozen
+and the caches are thread-safe, so renders can run on worker threads or in
+other processes.
+"""
+import functools
+from dataclasses import dataclass, fields
+
+from desoto import perf
+from desoto.services import docx_template
+
+PRESERVE_UPPER = frozenset({
+    'LLC', 'PLLC', 'INC', 'CO', 'CORP', 'LP', 'LLP', 'PA', 'PC', 'LTD',
+    'II', 'III', 'IV', 'JR', 'SR', 'MS', 'US',
+})
+
+
+@dataclass(frozen=True)
+class OrderSnapshot:
+    pin: str = ""
+    address: str = ""
+    owner: str = ""
+    city: str = ""
+    legal_desc: str = ""
+    tax_2024_total: str = ""
+    tax_2024_date_paid: str = ""
+    tax_2025_est: str = ""
+    lender: str = ""
+    borrower: str = ""
+    chain: tuple = ()  # ChainEntry rows for the GRANTOR/GRANTEE table
+
+    @classmethod
+    def from_mapping(cls, mapping: dict, chain=()):
+        """Snapshot from a dict of order fields; unknown keys are ignored."""
+        text = {f.name: "" if mapping.get(f.name) is None else str(mapping[f.name])
+                for f in fields(cls) if f.name != "chain"}
+        return cls(chain=tuple(chain or ()), **text)
+
+
+@functools.lru_cache(maxsize=4096)
+def smart_title_case(text):
+    if not text or text.strip().isdigit() or '$' in text:
+        return text
+    result = []
+    for word in text.split():
+        clean_word = word.strip('.,;:')
+        if clean_word.upper() in PRESERVE_UPPER:
+            result.append(clean_word.upper() + word[len(clean_word):])
+        else:
+            result.append(word.capitalize())
+    return ' '.join(result)
+
+
+def _money(amount: str) -> str:
+    return ("$" + amount) if amount else ""
+
+
+def template_values(order: OrderSnapshot) -> dict:
+    """Map an order's fields to the template's {PLACEHOLDER} keys."""
+    return {
+        "PARCEL": order.pin,
+        "PROPSTRE": smart_title_case(order.address),
+        "SLRLAST": smart_title_case(order.owner),
+        "CITY_STATE_ZIP": smart_title_case(order.city),
+        "LEGAL_DESC": smart_title_case(order.legal_desc),
+        "TAXAMT": _money(order.tax_2024_total),
+        "TAXDAT": order.tax_2024_date_paid,
+        "TAX_2025_EST": _money(order.tax_2025_est),
+        "Lender": smart_title_case(order.lender),
+        "BYRLAST": smart_title_case(order.borrower),
+        "LOAN_AMOUNT": "",
+    }
+
+
+def render_document(order: OrderSnapshot, template_path: str, output_path: str = None):
+    """Fill the template for one order and return the document.
+
+    The document is also saved to output_path when one is given.
+    """
+    with perf.span("render", deeds=len(order.chain), saved=bool(output_path)):
+        return docx_template.render(template_path, template_values(order), list(order.chain), output_path)
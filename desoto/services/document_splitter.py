@@ -3,6 +3,8 @@ import io
 import PyPDF2
 from typing import Tuple, List
 
+from desoto import perf
+
 # OPTIMIZATION 1: Pre-compiled regex patterns
 CHAIN_INDICATORS_PATTERN = re.compile(
     r'CHAIN OF TITLE|FILED GRANTOR GRANTEE INSTRUMENT|'
@@ -53,7 +55,7 @@ def extract_pages_by_type(pdf_path: str) -> Tuple[bytes, bytes, str]:
         # --- SINGLE READ OPTIMIZATION ---
         # Read the PDF from disk only ONCE. Both text extraction for classification
         # and page manipulation will happen in this single pass.
-        with open(pdf_path, 'rb') as file:
+        with open(pdf_path, 'rb') as file, perf.span("classify") as s:
             pdf_reader = PyPDF2.PdfReader(file)
             
             for page in pdf_reader.pages:
@@ -66,19 +68,23 @@ def extract_pages_by_type(pdf_path: str) -> Tuple[bytes, bytes, str]:
                     chain_writer.add_page(page)
                 elif page_type == 'tax':
                     tax_writer.add_page(page)
+            s.set(pages=len(pdf_reader.pages), chain_pages=len(chain_writer.pages),
+                  tax_pages=len(tax_writer.pages))
 
         # --- Create in-memory PDFs from the writers ---
-        chain_pdf_bytes = b''
-        if len(chain_writer.pages) > 0:
-            with io.BytesIO() as stream:
-                chain_writer.write(stream)
-                chain_pdf_bytes = stream.getvalue()
+        with perf.span("split") as s:
+            chain_pdf_bytes = b''
+            if len(chain_writer.pages) > 0:
+                with io.BytesIO() as stream:
+                    chain_writer.write(stream)
+                    chain_pdf_bytes = stream.getvalue()
 
-        tax_pdf_bytes = b''
-        if len(tax_writer.pages) > 0:
-            with io.BytesIO() as stream:
-                tax_writer.write(stream)
-                tax_pdf_bytes = stream.getvalue()
+            tax_pdf_bytes = b''
+            if len(tax_writer.pages) > 0:
+                with io.BytesIO() as stream:
+                    tax_writer.write(stream)
+                    tax_pdf_bytes = stream.getvalue()
+            s.set(bytes=len(chain_pdf_bytes) + len(tax_pdf_bytes))
         
         # --- Generate status message ---
         status_parts = []
@@ -0,0 +1,305 @@
+"""Compiled render plans for the Word output template.
+
+The template is parsed once per modification time. The plan records which
+body paragraphs hold which ``{PLACEHOLDER}`` keys and which table is the
+GRANTOR/GRANTEE chain table, so a render only loads the cached template
+bytes and writes values into those known locations.
+"""
+import bisect
+import copy
+import functools
+import io
+import itertools
+import os
+import re
+import struct
+import threading
+import zipfile
+import zlib
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+from docx import Document
+from docx.oxml.ns import qn
+from docx.text.paragraph import Paragraph
+
+PLACEHOLDER_RE = re.compile(r"\{([A-Za-z0-9_]+)\}")
+
+
+@dataclass
+class TemplatePlan:
+    path: str
+    mtime: float
+    data: bytes
+    # ordinal of the paragraph in body.iter(w:p) -> placeholder keys it contains
+    paragraphs: Dict[int, Tuple[str, ...]] = field(default_factory=dict)
+    chain_table: Optional[int] = None  # index into Document.tables
+
+
+def is_chain_table(table) -> bool:
+    if not table.rows:
+        return False
+    header_text = ' '.join(cell.text.upper() for cell in table.rows[0].cells)
+    return 'GRANTOR' in header_text and 'GRANTEE' in header_text
+
+
+def _paragraph_keys(p) -> Tuple[str, ...]:
+    text = "".join(r.text for r in p.runs)
+    return tuple(dict.fromkeys(PLACEHOLDER_RE.findall(text)))
+
+
+def compile_template(path: str) -> TemplatePlan:
+    """Parse the template and record where each placeholder and the chain table sit."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    mtime = os.path.getmtime(path)
+    doc = Document(io.BytesIO(data))
+    ordinals = {p: i for i, p in enumerate(doc.element.body.iter(qn('w:p')))}
+    plan = TemplatePlan(path=path, mtime=mtime, data=data)
+
+    # Same scope the renderer has always filled: body paragraphs and the
+    # cells of every table except the chain table.
+    candidates = list(doc.paragraphs)
+    for t_idx, table in enumerate(doc.tables):
+        if is_chain_table(table):
+            if plan.chain_table is None:
+                plan.chain_table = t_idx
+            continue
+        for row in table.rows:
+            for cell in row.cells:
+                candidates.extend(cell.paragraphs)
+
+    for p in candidates:
+        keys = _paragraph_keys(p)
+        if keys:
+            plan.paragraphs[ordinals[p._p]] = keys
+    return plan
+
+
+_lock = threading.Lock()
+_plans: Dict[str, TemplatePlan] = {}
+
+
+def get_plan(path: str) -> TemplatePlan:
+    """Cached plan for the template, recompiled when the file's mtime changes."""
+    path = os.path.abspath(path)
+    mtime = os.path.getmtime(path)
+    with _lock:
+        plan = _plans.get(path)
+        if plan is None or plan.mtime != mtime:
+            plan = _plans[path] = compile_template(path)
+        return plan
+
+
+@functools.lru_cache(maxsize=64)
+def _alternation(keys: Tuple[str, ...]):
+    # Longest first so {LOT} never shadows {LOT_NUMBER}-style keys.
+    ordered = sorted(keys, key=len, reverse=True)
+    return re.compile("|".join(re.escape(f"{{{k}}}") for k in ordered))
+
+
+def replace_in_paragraph(p, values):
+    """Replace {KEY} placeholders in a paragraph, keeping run formatting.
+
+    The joined run text is scanned once for all keys. Each match is written
+    into the run where it starts, with any spanned runs emptied and the
+    remainder of the last run kept, as the per-key loop did before.
+    """
+    if not values:
+        return
+    runs = p.runs
+    texts = [run.text for run in runs]
+    matches = list(_alternation(tuple(values)).finditer("".join(texts)))
+    if not matches:
+        return
+
+    ends = list(itertools.accumulate(len(t) for t in texts))
+    starts = [e - len(t) for e, t in zip(ends, texts)]
+    changed = set()
+    # Right to left, so offsets of earlier matches stay valid as runs change length.
+    for m in reversed(matches):
+        start_idx = bisect.bisect_right(ends, m.start())
+        end_idx = bisect.bisect_left(ends, m.end())
+        start_pos = m.start() - starts[start_idx]
+        end_pos = m.end() - starts[end_idx]
+        value = str(values[m.group()[1:-1]])
+        if start_idx == end_idx:
+            t = texts[start_idx]
+            texts[start_idx] = t[:start_pos] + value + t[end_pos:]
+        else:
+            texts[start_idx] = texts[start_idx][:start_pos] + value
+            for i in range(start_idx + 1, end_idx):
+                texts[i] = ""
+            texts[end_idx] = texts[end_idx][end_pos:]
+        changed.update(range(start_idx, end_idx + 1))
+
+    for i in changed:
+        runs[i].text = texts[i]
+
+
+_XML_SPACE = qn('xml:space')
+
+
+def _prototype_row(table):
+    """A detached data row as python-docx would build it, each cell holding one run."""
+    row = table.add_row()
+    for cell in row.cells:
+        cell.text = "x"
+    table._tbl.remove(row._tr)
+    return row._tr
+
+
+def _set_run_text(r, t, value):
+    if not value:
+        r.remove(t)
+    elif "\t" in value or "\n" in value or "\r" in value:
+        r.text = value  # let python-docx turn these into w:tab / w:br
+    else:
+        t.text = value
+        if value != value.strip():
+            t.set(_XML_SPACE, "preserve")
+
+
+def chain_row_values(deed):
+    return (deed.grantor, deed.grantee, deed.instrument, deed.date_string, deed.book_page)
+
+
+def fill_chain_table(table, chain_deeds):
+    """Replace the table's data rows with one row per deed, in the given order.
+
+    Rows are deep copies of a single prototype row with the text set on its
+    w:t elements, which avoids building row and cell wrappers per deed.
+    """
+    tbl = table._tbl
+    for tr in tbl.tr_lst[1:]:
+        tbl.remove(tr)
+    proto = _prototype_row(table)
+    for deed in chain_deeds:
+        tr = copy.deepcopy(proto)
+        for t, value in zip(list(tr.iter(qn('w:t'))), chain_row_values(deed)):
+            _set_run_text(t.getparent(), t, value or "")
+        tbl.append(tr)
+
+
+# ZIP records written by write_package (PKWARE APPNOTE 4.3); ZIP64 is left to zipfile.
+_LOCAL = struct.Struct("<4s5H3L2H")      # local file header
+_CENTRAL = struct.Struct("<4s6H3L5H2L")  # central directory record
+_END = struct.Struct("<4s4H2LH")         # end of central directory
+_ZIP32 = 0xFFFFFFFF
+_UTF8_NAME = 0x800
+_DESCRIPTOR = 0x08
+
+
+def _central_records(source: bytes):
+    """Raw central directory records of a plain (single-disk, non-ZIP64) zip, else None."""
+    end = source.rfind(b"PK\x05\x06", max(0, len(source) - _END.size - 0xFFFF))
+    if end < 0:
+        return None
+    _, disk, cd_disk, _, count, _, offset, _ = _END.unpack_from(source, end)
+    if disk or cd_disk or count == 0xFFFF or offset == _ZIP32:
+        return None
+    records, pos = [], offset
+    for _ in range(count):
+        f = _CENTRAL.unpack_from(source, pos)
+        if f[0] != b"PK\x01\x02" or _ZIP32 in (f[8], f[9], f[16]):
+            return None
+        size = _CENTRAL.size + f[10] + f[11] + f[12]
+        records.append((f, source[pos:pos + size]))
+        pos += size
+    return records
+
+
+def _member_name(f, record: bytes) -> str:
+    raw = record[_CENTRAL.size:_CENTRAL.size + f[10]]
+    return raw.decode("utf-8" if f[3] & _UTF8_NAME else "cp437")
+
+
+def _stored_member(source: bytes, f) -> bytes:
+    """Local header, name, extra field, compressed data and data descriptor, as stored."""
+    start = f[16]
+    name_len, extra_len = struct.unpack_from("<2H", source, start + 26)
+    end = start + _LOCAL.size + name_len + extra_len + f[8]
+    if f[3] & _DESCRIPTOR:
+        end += 16 if source[end:end + 4] == b"PK\x07\x08" else 12
+    return source[start:end]
+
+
+def _deflated_member(f, record: bytes, data: bytes):
+    """(local header and compressed data, central record) for a replaced member."""
+    compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+    packed = compressor.compress(data) + compressor.flush()
+    name = record[_CENTRAL.size:_CENTRAL.size + f[10]]
+    flags, crc = f[3] & _UTF8_NAME, zlib.crc32(data)
+    local = _LOCAL.pack(b"PK\x03\x04", 20, flags, zipfile.ZIP_DEFLATED, f[5], f[6],
+                        crc, len(packed), len(data), len(name), 0) + name
+    central = _CENTRAL.pack(f[0], f[1], 20, flags, zipfile.ZIP_DEFLATED, f[5], f[6],
+                            crc, len(packed), len(data), *f[10:16], 0) + record[_CENTRAL.size:]
+    return local + packed, central
+
+
+def write_package(source: bytes, output_path: str, parts: Dict[str, bytes]):
+    """Write the source package with the given members replaced.
+
+    Every other member is copied byte for byte (local header, compressed
+    data and any data descriptor), and its central directory record is
+    reused with the new offset, so styles, fonts and images are neither
+    re-serialized nor recompressed. ZIP64 and multi-disk sources are
+    rewritten through zipfile instead.
+    """
+    records = _central_records(source)
+    chunks, directory, offset = [], [], 0
+    for f, record in records or ():
+        name = _member_name(f, record)
+        if name in parts:
+            member, central = _deflated_member(f, record, parts[name])
+        else:
+            member, central = _stored_member(source, f), record
+        directory.append(central[:42] + struct.pack("<L", offset) + central[46:])
+        chunks.append(member)
+        offset += len(member)
+    size = sum(map(len, directory))
+    if records is None or offset + size >= _ZIP32:
+        _rewrite_package(source, output_path, parts)
+        return
+    end = _END.pack(b"PK\x05\x06", 0, 0, len(directory), len(directory), size, offset, 0)
+    with open(output_path, "wb") as out:
+        out.writelines(chunks)
+        out.writelines(directory)
+        out.write(end)
+
+
+def _rewrite_package(source: bytes, output_path: str, parts: Dict[str, bytes]):
+    with zipfile.ZipFile(io.BytesIO(source)) as zin, \
+            zipfile.ZipFile(output_path, "w", zipfile.ZIP_DEFLATED) as zout:
+        for info in zin.infolist():
+            if info.filename in parts:
+                replaced = zipfile.ZipInfo(info.filename, info.date_time)
+                replaced.compress_type = zipfile.ZIP_DEFLATED
+                replaced.external_attr = info.external_attr
+                zout.writestr(replaced, parts[info.filename])
+            else:
+                zout.writestr(copy.copy(info), zin.read(info), compress_type=info.compress_type)
+
+
+def save_document(doc, source: bytes, output_path: str):
+    """Save a document loaded from source, rewriting only its main document part."""
+    write_package(source, output_path, {doc.part.partname.membername: doc.part.blob})
+
+
+def render(template_path: str, values: dict, chain_deeds, output_path: str = None):
+    """Fill the template with values and chain deeds; saved to output_path if given."""
+    plan = get_plan(template_path)
+    doc = Document(io.BytesIO(plan.data))
+    paragraphs = list(doc.element.body.iter(qn('w:p')))
+    for ordinal, keys in plan.paragraphs.items():
+        present = {k: values[k] for k in keys if k in values}
+        if present:
+            replace_in_paragraph(Paragraph(paragraphs[ordinal], None), present)
+
+    if plan.chain_table is not None and chain_deeds:
+        chain_deeds = sorted(chain_deeds, key=lambda d: d.date)
+        fill_chain_table(doc.tables[plan.chain_table], chain_deeds)
+
+    if output_path:
+        save_document(doc, plan.data, output_path)
+    return doc
@@ -0,0 +1,460 @@
+"""Offline copy of GIS layer 29 for instant address lookups.
+
+Build it once (it pages through the whole layer) and parcels.query will
+answer prefix and token searches from it, going to the live service only
+when the index has no match. A nightly sync keeps owner names current by
+pulling only features edited since the previous run:
+
+    python -m desoto.services.parcel_index build
+    python -m desoto.services.parcel_index sync
+    python -m desoto.services.parcel_index history
+    python -m desoto.services.parcel_index search "405 MAIN"
+"""
+import argparse
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+
+from desoto import perf
+
+INDEX_PATH = os.environ.get(
+    "DESOTO_PARCEL_INDEX",
+    os.path.join(os.path.expanduser("~"), ".desoto", "parcels.sqlite"),
+)
+
+COLUMNS = ["FULL_ADDR", "PIN", "OWNER_NAME", "SECOND_OWNER",
+           "CITY", "STATE", "ZIP_CODE", "SUBD_NAME", "LOT"]
+FTS_COLUMNS = ["FULL_ADDR", "OWNER_NAME", "SECOND_OWNER", "SUBD_NAME"]
+PAGE_SIZE = 1000
+EDIT_FIELD = "last_edited_date"  # used when the layer reports no editFieldsInfo
+
+_TOKEN_RE = re.compile(r"[A-Z0-9]+")
+_local = threading.local()
+
+
+def _schema(fts: bool) -> str:
+    cols = ", ".join(f"{c} TEXT" for c in COLUMNS)
+    sql = f"""
+        CREATE TABLE IF NOT EXISTS parcels (
+            OBJECTID INTEGER PRIMARY KEY, {cols}, ADDR_KEY TEXT);
+        CREATE INDEX IF NOT EXISTS parcels_addr_key ON parcels(ADDR_KEY);
+        CREATE INDEX IF NOT EXISTS parcels_pin ON parcels(PIN);
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+        CREATE TABLE IF NOT EXISTS sync_log (
+            started_at REAL, seconds REAL, mode TEXT,
+            fetched INTEGER, inserted INTEGER, updated INTEGER, total INTEGER);
+    """
+    if fts:
+        fts_cols = ", ".join(FTS_COLUMNS)
+        new_vals = ", ".join(f"new.{c}" for c in FTS_COLUMNS)
+        old_vals = ", ".join(f"old.{c}" for c in FTS_COLUMNS)
+        sql += f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS parcels_fts USING fts5(
+            {fts_cols}, content='parcels', content_rowid='OBJECTID');
+        CREATE TRIGGER IF NOT EXISTS parcels_ai AFTER INSERT ON parcels BEGIN
+            INSERT INTO parcels_fts(rowid, {fts_cols}) VALUES (new.OBJECTID, {new_vals});
+        END;
+        CREATE TRIGGER IF NOT EXISTS parcels_ad AFTER DELETE ON parcels BEGIN
+            INSERT INTO parcels_fts(parcels_fts, rowid, {fts_cols})
+            VALUES ('delete', old.OBJECTID, {old_vals});
+        END;
+        CREATE TRIGGER IF NOT EXISTS parcels_au AFTER UPDATE ON parcels BEGIN
+            INSERT INTO parcels_fts(parcels_fts, rowid, {fts_cols})
+            VALUES ('delete', old.OBJECTID, {old_vals});
+            INSERT INTO parcels_fts(rowid, {fts_cols}) VALUES (new.OBJECTID, {new_vals});
+        END;
+        """
+    return sql
+
+
+def _fts_available(conn) -> bool:
+    try:
+        conn.execute("CREATE VIRTUAL TABLE temp._fts_probe USING fts5(x)")
+        conn.execute("DROP TABLE temp._fts_probe")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def connect(path: str = None) -> sqlite3.Connection:
+    """Open (creating if needed) an index database for writing."""
+    path = path or INDEX_PATH
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.executescript(_schema(_fts_available(conn)))
+    return conn
+
+
+def upsert(conn, rows) -> int:
+    """Insert feature attribute dicts keyed by OBJECTID, updating rows that already exist.
+
+    An ON CONFLICT update rather than INSERT OR REPLACE: REPLACE deletes the
+    old row without firing parcels_ad, which would leave its tokens in the
+    FTS index. The update fires parcels_au, which swaps them.
+    """
+    cols = (*COLUMNS, "ADDR_KEY")
+    placeholders = ", ".join("?" for _ in range(len(cols) + 1))
+    updates = ", ".join(f"{c} = excluded.{c}" for c in cols)
+    data = [
+        (a["OBJECTID"], *(_text(a.get(c)) for c in COLUMNS), (a.get("FULL_ADDR") or "").upper())
+        for a in rows
+    ]
+    conn.executemany(
+        f"INSERT INTO parcels (OBJECTID, {', '.join(cols)}) VALUES ({placeholders}) "
+        f"ON CONFLICT(OBJECTID) DO UPDATE SET {updates}",
+        data,
+    )
+    return len(data)
+
+
+def _text(value):
+    return "" if value is None else str(value)
+
+
+def set_meta(conn, **values):
+    conn.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                     [(k, str(v)) for k, v in values.items()])
+
+
+def get_meta(conn, key, default=None):
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else default
+
+
+def fetch_page(session, where: str, offset: int, count: int = PAGE_SIZE,
+               out_fields: str = None, order_by: str = "OBJECTID") -> tuple[list[dict], bool]:
+    """One page of layer-29 attributes plus ArcGIS' exceededTransferLimit flag."""
+    from desoto.services.parcels import PARCEL_URL, FIELDS
+    with perf.span("http", call="parcel_index.fetch_page", offset=offset):
+        r = session.get(
+            PARCEL_URL,
+            params={
+                "where": where,
+                "outFields": out_fields or f"OBJECTID,{FIELDS}",
+                "returnGeometry": "false",
+                "orderByFields": order_by,
+                "resultOffset": offset,
+                "resultRecordCount": count,
+                "f": "json",
+            },
+            timeout=60,
+        )
+        r.raise_for_status()
+        data = r.json()
+    if "error" in data:
+        raise RuntimeError(data["error"].get("message", "ArcGIS error"))
+    return [f["attributes"] for f in data.get("features", [])], bool(data.get("exceededTransferLimit"))
+
+
+def iter_pages(session, where: str, page_size: int = PAGE_SIZE, out_fields: str = None,
+               order_by: str = "OBJECTID"):
+    """Yield successive pages of a layer-29 query until it is exhausted."""
+    offset = 0
+    while True:
+        rows, more = fetch_page(session, where, offset, page_size, out_fields, order_by)
+        if rows:
+            yield rows
+        if not rows or (not more and len(rows) < page_size):
+            return
+        offset += len(rows)
+
+
+def edit_date_field(session):
+    """The layer's editor-tracking date field, or None if it has none."""
+    from desoto.services.parcels import PARCEL_URL
+    try:
+        r = session.get(PARCEL_URL.rsplit("/query", 1)[0], params={"f": "json"}, timeout=30)
+        r.raise_for_status()
+        info = r.json()
+    except Exception as exc:
+        print("Layer info lookup failed:", exc)
+        return None
+    field = (info.get("editFieldsInfo") or {}).get("editDateField")
+    names = {f.get("name") for f in info.get("fields") or []}
+    if field:
+        return field
+    return EDIT_FIELD if EDIT_FIELD in names else None
+
+
+def _watermarks(rows, edit_field):
+    max_oid = max((a["OBJECTID"] for a in rows), default=0)
+    max_edit = max((a.get(edit_field) or 0 for a in rows), default=0) if edit_field else 0
+    return max_oid, max_edit
+
+
+def _out_fields(edit_field):
+    from desoto.services.parcels import FIELDS
+    return f"OBJECTID,{FIELDS}" + (f",{edit_field}" if edit_field else "")
+
+
+def build(path: str = None, page_size: int = PAGE_SIZE, progress=print) -> int:
+    """Download the whole layer into a fresh index and swap it into place."""
+    import requests
+
+    path = path or INDEX_PATH
+    tmp_path = path + ".building"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    start = time.perf_counter()
+    started_at = time.time()
+    conn = connect(tmp_path)
+    total = oid_mark = edit_mark = 0
+    try:
+        with requests.Session() as s:
+            edit_field = edit_date_field(s)
+            for rows in iter_pages(s, "1=1", page_size, _out_fields(edit_field)):
+                total += upsert(conn, rows)
+                oid, edited = _watermarks(rows, edit_field)
+                oid_mark, edit_mark = max(oid_mark, oid), max(edit_mark, edited)
+                conn.commit()
+                progress(f"  {total:,} parcels")
+        seconds = round(time.perf_counter() - start, 2)
+        set_meta(conn, built_at=started_at, rows=total, build_seconds=seconds,
+                 edit_field=edit_field or "", oid_watermark=oid_mark, edit_watermark=edit_mark)
+        conn.execute("INSERT INTO sync_log VALUES (?, ?, 'full', ?, ?, 0, ?)",
+                     (started_at, seconds, total, total, total))
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp_path, path)
+    progress(f"Indexed {total:,} parcels in {time.perf_counter() - start:.1f}s -> {path}")
+    return total
+
+
+def sync(path: str = None, page_size: int = PAGE_SIZE, progress=print) -> dict:
+    """Upsert features added or edited since the last build/sync.
+
+    Uses the layer's edit-date field when it has one (catching owner
+    changes on existing parcels) and otherwise an OBJECTID watermark, which
+    only sees new parcels. Deleted features are not detected; a periodic
+    full build removes them.
+    """
+    import requests
+
+    path = path or INDEX_PATH
+    if not os.path.exists(path):
+        total = build(path, page_size, progress)
+        return {"mode": "full", "fetched": total, "inserted": total, "updated": 0,
+                "total": total, "seconds": None}
+
+    start = time.perf_counter()
+    started_at = time.time()
+    conn = connect(path)
+    try:
+        oid_mark = int(get_meta(conn, "oid_watermark", 0) or 0)
+        edit_mark = int(float(get_meta(conn, "edit_watermark", 0) or 0))
+        with requests.Session() as s:
+            edit_field = edit_date_field(s)
+            if edit_field and edit_mark:
+                # ArcGIS timestamps are second resolution; >= re-fetches the boundary second.
+                stamp = datetime.fromtimestamp(edit_mark // 1000, tz=timezone.utc)
+                where = (f"{edit_field} >= timestamp '{stamp:%Y-%m-%d %H:%M:%S}' "
+                         f"OR OBJECTID > {oid_mark}")
+                mode = "edit-date"
+            else:
+                where = f"OBJECTID > {oid_mark}"
+                mode = "objectid"
+
+            fetched = inserted = 0
+            for rows in iter_pages(s, where, page_size, _out_fields(edit_field)):
+                ids = [a["OBJECTID"] for a in rows]
+                existing = {r[0] for r in conn.execute(
+                    f"SELECT OBJECTID FROM parcels WHERE OBJECTID IN ({','.join('?' * len(ids))})",
+                    ids)}
+                fetched += upsert(conn, rows)
+                inserted += len(set(ids) - existing)
+                oid, edited = _watermarks(rows, edit_field)
+                oid_mark, edit_mark = max(oid_mark, oid), max(edit_mark, edited)
+                conn.commit()
+                progress(f"  {fetched:,} changed parcels")
+
+        total = conn.execute("SELECT COUNT(*) FROM parcels").fetchone()[0]
+        stats = {"mode": mode, "fetched": fetched, "inserted": inserted,
+                 "updated": fetched - inserted, "total": total,
+                 "seconds": round(time.perf_counter() - start, 2)}
+        set_meta(conn, synced_at=started_at, rows=total, edit_field=edit_field or "",
+                 oid_watermark=oid_mark, edit_watermark=edit_mark)
+        conn.execute("INSERT INTO sync_log VALUES (?, ?, ?, ?, ?, ?, ?)",
+                     (started_at, stats["seconds"], mode, fetched, inserted,
+                      stats["updated"], total))
+        conn.commit()
+    finally:
+        conn.close()
+    progress(f"Synced ({stats['mode']}): {stats['fetched']:,} fetched, "
+             f"{stats['inserted']:,} new, {stats['updated']:,} updated, "
+             f"{stats['total']:,} total in {stats['seconds']:.1f}s")
+    return stats
+
+
+def history(path: str = None, limit: int = 20) -> list[dict]:
+    """Most recent build/sync runs, newest first."""
+    path = path or INDEX_PATH
+    if not os.path.exists(path):
+        return []
+    conn = connect(path)
+    try:
+        conn.row_factory = sqlite3.Row
+        return [dict(r) for r in conn.execute(
+            "SELECT * FROM sync_log ORDER BY started_at DESC LIMIT ?", (limit,))]
+    finally:
+        conn.close()
+
+
+# ── lookups ───────────────────────────────────────────────────
+def _reader(path: str):
+    """Per-thread read-only connection, reopened when the file is rebuilt."""
+    try:
+        stamp = os.stat(path).st_mtime_ns
+    except OSError:
+        return None, False
+    conns = getattr(_local, "conns", None)
+    if conns is None:
+        conns = _local.conns = {}
+    cached = conns.get(path)
+    if cached and cached[0] == stamp:
+        return cached[1], cached[2]
+    if cached:
+        cached[1].close()
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    has_fts = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'parcels_fts'").fetchone() is not None
+    conns[path] = (stamp, conn, has_fts)
+    return conn, has_fts
+
+
+def available(path: str = None) -> bool:
+    return os.path.exists(path or INDEX_PATH)
+
+
+def search(text: str, limit: int = 10, path: str = None) -> list[dict]:
+    """Prefix search on FULL_ADDR, then token search; [] when nothing matches."""
+    path = path or INDEX_PATH
+    conn, has_fts = _reader(path)
+    if conn is None:
+        return []
+    cols = ", ".join(COLUMNS)
+    key = text.upper()
+    try:
+        rows = conn.execute(
+            f"SELECT DISTINCT {cols} FROM parcels WHERE ADDR_KEY >= ? AND ADDR_KEY < ? "
+            f"ORDER BY ADDR_KEY LIMIT ?",
+            (key, key + "\uffff", limit),
+        ).fetchall()
+        if not rows:
+            tokens = _TOKEN_RE.findall(key)
+            if tokens and has_fts:
+                match = " ".join(f'"{t}"*' for t in tokens)
+                rows = conn.execute(
+                    f"SELECT DISTINCT {', '.join('p.' + c for c in COLUMNS)} FROM parcels_fts "
+                    f"JOIN parcels p ON p.OBJECTID = parcels_fts.rowid "
+                    f"WHERE parcels_fts MATCH ? ORDER BY p.ADDR_KEY LIMIT ?",
+                    (f"FULL_ADDR : ({match})", limit),
+                ).fetchall()
+    except sqlite3.DatabaseError as exc:
+        print("Parcel index lookup failed:", exc)
+        return []
+    return [dict(r) for r in rows]
+
+
+def lookup_many(field: str, values, path: str = None) -> dict:
+    """Exact matches for PIN or upper-cased FULL_ADDR values, keyed by value."""
+    conn, _ = _reader(path or INDEX_PATH)
+    if conn is None or not values:
+        return {}
+    column = "ADDR_KEY" if field == "FULL_ADDR" else field
+    found = {}
+    values = list(values)
+    try:
+        for i in range(0, len(values), 500):  # stay under SQLite's bound-parameter limit
+            chunk = values[i:i + 500]
+            rows = conn.execute(
+                f"SELECT {', '.join(COLUMNS)}, {column} AS _key FROM parcels "
+                f"WHERE {column} IN ({','.join('?' * len(chunk))}) ORDER BY OBJECTID",
+                chunk,
+            )
+            for r in rows:
+                row = dict(r)
+                found.setdefault(row.pop("_key"), row)
+    except sqlite3.DatabaseError as exc:
+        print("Parcel index lookup failed:", exc)
+        return {}
+    return found
+
+
+def search_fields(fields, text: str, path: str = None) -> list[dict] | None:
+    """Every row where any of ``fields`` starts with text; None without an index."""
+    conn, _ = _reader(path or INDEX_PATH)
+    if conn is None:
+        return None
+    pattern = text.upper().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+    where = " OR ".join(f"UPPER({f}) LIKE ? ESCAPE '\\'" for f in fields)
+    try:
+        rows = conn.execute(
+            f"SELECT DISTINCT {', '.join(COLUMNS)} FROM parcels WHERE {where} ORDER BY ADDR_KEY",
+            [pattern] * len(fields),
+        ).fetchall()
+    except sqlite3.DatabaseError as exc:
+        print("Parcel index lookup failed:", exc)
+        return None
+    return [dict(r) for r in rows]
+
+
+def addresses(path: str = None) -> list[tuple[int, str]]:
+    """Every (OBJECTID, FULL_ADDR) in the index."""
+    conn, _ = _reader(path or INDEX_PATH)
+    if conn is None:
+        return []
+    return [tuple(r) for r in conn.execute("SELECT OBJECTID, FULL_ADDR FROM parcels")]
+
+
+def rows_by_ids(ids, path: str = None) -> list[dict]:
+    """Parcel rows for OBJECTIDs, in the order given."""
+    conn, _ = _reader(path or INDEX_PATH)
+    if conn is None or not ids:
+        return []
+    rows = conn.execute(
+        f"SELECT OBJECTID, {', '.join(COLUMNS)} FROM parcels "
+        f"WHERE OBJECTID IN ({','.join('?' * len(ids))})", list(ids))
+    by_id = {r["OBJECTID"]: {c: r[c] for c in COLUMNS} for r in rows}
+    return [by_id[i] for i in ids if i in by_id]
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Local parcel index for layer 29.")
+    ap.add_argument("--db", default=INDEX_PATH, help=f"index file (default {INDEX_PATH})")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    b = sub.add_parser("build", help="download the whole layer into the index")
+    b.add_argument("--page-size", type=int, default=PAGE_SIZE)
+    y = sub.add_parser("sync", help="pull features changed since the last sync")
+    y.add_argument("--page-size", type=int, default=PAGE_SIZE)
+    sub.add_parser("history", help="show recent build/sync runs")
+    q = sub.add_parser("search", help="query the index")
+    q.add_argument("text")
+    q.add_argument("--limit", type=int, default=10)
+    args = ap.parse_args(argv)
+
+    if args.cmd == "build":
+        build(args.db, args.page_size)
+    elif args.cmd == "sync":
+        sync(args.db, args.page_size)
+    elif args.cmd == "history":
+        for run in history(args.db):
+            when = datetime.fromtimestamp(run["started_at"]).strftime("%Y-%m-%d %H:%M")
+            print(f"{when}  {run['mode']:<9} {run['seconds']:>7.1f}s  fetched {run['fetched']:>7,}  "
+                  f"new {run['inserted']:>6,}  updated {run['updated']:>6,}  total {run['total']:>8,}")
+    else:
+        start = time.perf_counter()
+        rows = search(args.text, args.limit, args.db)
+        took = (time.perf_counter() - start) * 1000
+        for r in rows:
+            print(f"{r['FULL_ADDR']:<40} {r['PIN']}")
+        print(f"{len(rows)} result(s) in {took:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
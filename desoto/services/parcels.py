@@ -1,7 +1,18 @@
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import requests
+from desoto import perf
+from desoto.services import parcel_index, address_index
+
+# ArcGIS host for the layer-29 parcel queries; DESOTO_GIS_BASE overrides it.
+GIS_BASE = os.environ.get("DESOTO_GIS_BASE", "https://gis.desotocountyms.gov").rstrip("/")
 
 PARCEL_URL = (
-    "https://gis.desotocountyms.gov/arcgis/rest/services/"
+    f"{GIS_BASE}/arcgis/rest/services/"
     "CountyWebMap/County_Web_Map/MapServer/29/query"
 )
 
@@ -9,26 +20,326 @@ FIELDS = (
     "FULL_ADDR,PIN,OWNER_NAME,SECOND_OWNER,"
     "CITY,STATE,ZIP_CODE,SUBD_NAME,LOT"
 )
+SUGGEST_FIELDS = "FULL_ADDR,PIN"  # all the autocomplete dropdown shows
+
+CACHE_TTL = 300     # seconds a prefix result stays valid
+CACHE_SIZE = 256    # prefixes kept, least recently used evicted first
+DETAIL_TTL = 900    # seconds a full parcel record stays valid
+DETAIL_SIZE = 512   # parcel records kept by PIN
+
+STREAM_PAGE = 200        # rows per page for owner/subdivision searches
+SEARCH_MODES = {         # query mode -> fields matched by prefix
+    "Owner": ("OWNER_NAME", "SECOND_OWNER"),
+    "Subdivision": ("SUBD_NAME",),
+}
+
+BATCH_MAX_ITEMS = 100    # values per IN (...) clause
+BATCH_MAX_WHERE = 4000   # characters per where clause
+BATCH_WORKERS = 4        # chunks queried concurrently
+
+_local = threading.local()
+
+
+def _http() -> requests.Session:
+    """This thread's keep-alive session, so repeated lookups reuse the GIS connection."""
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = _local.session = requests.Session()
+    return session
+
+
+class PrefixCache:
+    """LRU/TTL cache of address-prefix results.
+
+    A prefix whose query came back with fewer rows than its limit is
+    *exhausted*: the rows are every match. Any longer prefix is then
+    answered locally by filtering those rows instead of asking the server.
+    """
+
+    def __init__(self, maxsize=CACHE_SIZE, ttl=CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # prefix -> (stored_at, limit, rows)
+        self._lock = threading.Lock()
+
+    def get(self, prefix, limit):
+        now = time.monotonic()
+        with self._lock:
+            for end in range(len(prefix), 0, -1):
+                key = prefix[:end]
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                stored_at, cached_limit, rows = entry
+                if now - stored_at > self.ttl:
+                    del self._entries[key]
+                    continue
+                exhausted = len(rows) < cached_limit
+                if key == prefix and (exhausted or cached_limit >= limit):
+                    found = rows[:limit]
+                elif exhausted:
+                    found = [r for r in rows
+                             if (r.get("FULL_ADDR") or "").upper().startswith(prefix)][:limit]
+                else:
+                    continue
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return found
+            self.misses += 1
+            return None
+
+    def put(self, prefix, limit, rows):
+        with self._lock:
+            self._entries[prefix] = (time.monotonic(), limit, rows)
+            self._entries.move_to_end(prefix)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
 
-def query(prefix: str, limit: int = 10):
-    prefix_sql = prefix.upper().replace("'", "''")
+class RecordCache:
+    """Keyed LRU/TTL cache for whole results (parcel records by PIN, etc.)."""
+
+    def __init__(self, maxsize=DETAIL_SIZE, ttl=DETAIL_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (stored_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_cache = PrefixCache()
+_caches = {FIELDS: _cache, SUGGEST_FIELDS: PrefixCache()}
+_details = RecordCache()
+_streams = RecordCache(maxsize=64, ttl=CACHE_TTL)
+
+
+def query(prefix: str, limit: int = 10, fields: str = FIELDS):
+    prefix = prefix.upper()
+    # Exact prefix/token match locally, then a prefix match on normalized addresses.
+    local = parcel_index.search(prefix, limit) or address_index.search(prefix, limit, fuzzy=False)
+    if local:
+        return local
+    # Near-misses ("123 Mian St") only when the live service has nothing either.
+    return _live_query(prefix, limit, fields) or address_index.search(prefix, limit)
+
+
+def _live_query(prefix: str, limit: int, fields: str) -> list[dict]:
+    # LIKE wildcards in the input can't be narrowed locally
+    cacheable = "%" not in prefix and "_" not in prefix
+    cache = _caches.setdefault(fields, PrefixCache())
+    if cacheable:
+        cached = cache.get(prefix, limit)
+        if cached is not None:
+            return cached
+
+    prefix_sql = prefix.replace("'", "''")
     where = f"UPPER(FULL_ADDR) LIKE '{prefix_sql}%'"
     try:
-        r = requests.get(
+        with perf.span("http", call="parcels.query") as s:
+            r = _http().get(
+                PARCEL_URL,
+                params={
+                    "where": where,
+                    "outFields": fields,
+                    "returnGeometry": "false",
+                    "returnDistinctValues": "true",
+                    "orderByFields": "FULL_ADDR",
+                    "resultRecordCount": limit,
+                    "f": "json",
+                },
+                timeout=15,
+            )
+            r.raise_for_status()
+            data = r.json()
+            if "error" in data:
+                raise RuntimeError(data["error"].get("message", "ArcGIS error"))
+            rows = [f["attributes"] for f in data.get("features", [])]
+            s.set(rows=len(rows))
+    except Exception as exc:
+        print("Parcel lookup failed:", exc)
+        return []
+    if cacheable:
+        cache.put(prefix, limit, rows)
+    return rows
+
+
+def suggest(prefix: str, limit: int = 10):
+    """Lean autocomplete rows: FULL_ADDR and PIN only."""
+    return query(prefix, limit, fields=SUGGEST_FIELDS)
+
+
+def detail(pin: str):
+    """Full attribute record for one PIN, or None if it can't be found."""
+    cached = _details.get(pin)
+    if cached is not None:
+        return cached
+    row = parcel_index.lookup_many("PIN", [pin]).get(pin)
+    if row is None:
+        try:
+            row = _fetch_in("PIN", [pin]).get(pin)
+        except Exception as exc:
+            print("Parcel detail lookup failed:", exc)
+            return None
+    if row is not None:
+        _details.put(pin, row)
+    return row
+
+
+def iter_search(mode: str, text: str, page_size: int = STREAM_PAGE):
+    """Yield pages of every parcel whose owner or subdivision starts with text.
+
+    ``mode`` is a key of SEARCH_MODES. Pages come straight from ArcGIS
+    (resultOffset paging) so callers can show the first rows while the rest
+    load; stop iterating to abandon the search. Complete result sets are
+    cached, and the local parcel index answers in one page when present.
+    """
+    fields = SEARCH_MODES[mode]
+    text = " ".join(text.upper().split())
+    key = (mode, text)
+    cached = _streams.get(key)
+    if cached is not None:
+        yield cached
+        return
+    local = parcel_index.search_fields(fields, text)
+    if local is not None:
+        _streams.put(key, local)
+        yield local
+        return
+
+    literal = text.replace("'", "''")
+    where = " OR ".join(f"UPPER({f}) LIKE '{literal}%'" for f in fields)
+    rows = []
+    for page in parcel_index.iter_pages(_http(), where, page_size, f"OBJECTID,{FIELDS}",
+                                        order_by="FULL_ADDR,OBJECTID"):
+        for a in page:
+            a.pop("OBJECTID", None)
+        rows += page
+        yield page
+    _streams.put(key, rows)
+
+
+# ── bulk resolution ──────────────────────────────────────────
+_PIN_RE = re.compile(r"^[0-9][0-9A-Z.\-]*$")
+
+
+def _normalize(item: str) -> str:
+    return " ".join(item.upper().split())
+
+
+def _chunks(values, quote):
+    """Split values into IN-lists under both the item and length limits."""
+    chunk, length = [], 0
+    for v in values:
+        literal = quote(v)
+        if chunk and (len(chunk) >= BATCH_MAX_ITEMS or length + len(literal) + 1 > BATCH_MAX_WHERE):
+            yield chunk
+            chunk, length = [], 0
+        chunk.append(v)
+        length += len(literal) + 1
+    if chunk:
+        yield chunk
+
+
+def _fetch_in(field, values):
+    column = "UPPER(FULL_ADDR)" if field == "FULL_ADDR" else field
+    literals = ",".join("'" + v.replace("'", "''") + "'" for v in values)
+    with perf.span("http", call="parcels.fetch_in", items=len(values)):
+        r = _http().post(
             PARCEL_URL,
-            params={
-                "where": where,
+            data={
+                "where": f"{column} IN ({literals})",
                 "outFields": FIELDS,
                 "returnGeometry": "false",
-                "returnDistinctValues": "true",
                 "orderByFields": "FULL_ADDR",
-                "resultRecordCount": limit,
                 "f": "json",
             },
-            timeout=15,
+            timeout=30,
         )
         r.raise_for_status()
-        return [f["attributes"] for f in r.json().get("features", [])]
-    except Exception as exc:
-        print("Parcel lookup failed:", exc)
-        return []
+        data = r.json()
+    if "error" in data:
+        raise RuntimeError(data["error"].get("message", "ArcGIS error"))
+    found = {}
+    for f in data.get("features", []):
+        a = f["attributes"]
+        key = _normalize(a.get("FULL_ADDR") or "") if field == "FULL_ADDR" else a.get("PIN")
+        found.setdefault(key, a)
+    return found
+
+
+def resolve_many(items, field: str = None, workers: int = BATCH_WORKERS):
+    """Resolve a list of PINs and/or full addresses in bulk.
+
+    Each item is treated as a PIN when it has no spaces and starts with a
+    digit, otherwise as a full address, unless ``field`` ("PIN" or
+    "FULL_ADDR") forces one. The local parcel index answers what it can;
+    the rest go to the server as concurrent ``IN (...)`` queries.
+
+    Returns (results, unmatched): results[i] is the attribute dict for
+    items[i] or None, and unmatched lists the items that were not found.
+    """
+    keys = []
+    wanted = {"PIN": set(), "FULL_ADDR": set()}
+    for item in items:
+        value = _normalize(item)
+        kind = field or ("PIN" if _PIN_RE.match(value) else "FULL_ADDR")
+        keys.append((kind, value))
+        if value:
+            wanted[kind].add(value)
+
+    found = {}
+    for kind, values in wanted.items():
+        for value, row in parcel_index.lookup_many(kind, values).items():
+            found[(kind, value)] = row
+
+    jobs = []
+    for kind, values in wanted.items():
+        missing = sorted(v for v in values if (kind, v) not in found)
+        jobs += [(kind, chunk) for chunk in _chunks(missing, lambda v: f"'{v}'")]
+
+    def run(job):
+        kind, chunk = job
+        try:
+            return kind, _fetch_in(kind, chunk)
+        except Exception as exc:
+            print(f"Parcel batch lookup failed ({len(chunk)} items):", exc)
+            return kind, {}
+
+    if jobs:
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(jobs)))) as pool:
+            for kind, rows in pool.map(run, jobs):
+                for value, row in rows.items():
+                    found[(kind, value)] = row
+                    _details.put(row.get("PIN"), row)
+
+    results = [found.get(key) for key in keys]
+    unmatched = [item for item, row in zip(items, results) if row is None]
+    return results, unmatched
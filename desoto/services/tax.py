@@ -1,8 +1,12 @@
-import requests, re
-from bs4 import BeautifulSoup
+import functools, os, re, threading
 
-WELCOME = "http://www.desotoms.info/Webpgms/welcome.pgm"
-CGI     = "http://www.desotoms.info/Webpgms/aptaxest7.pgm"
+from desoto import perf
+
+# Host of the county's tax estimator pages; DESOTO_TAX_BASE overrides it.
+TAX_BASE = os.environ.get("DESOTO_TAX_BASE", "http://www.desotoms.info").rstrip("/")
+
+WELCOME = f"{TAX_BASE}/Webpgms/welcome.pgm"
+CGI     = f"{TAX_BASE}/Webpgms/aptaxest7.pgm"
 UA_HDR  = {"User-Agent": "Mozilla/5.0"}
 
 DISTRICT_MAP = {
@@ -15,25 +19,94 @@ DISTRICT_MAP = {
 }
 DISTRICT_OPTIONS = list(DISTRICT_MAP.keys())
 
-_MONEY_RE = re.compile(r"\$?([\d,]+\.\d{2})", re.A)
+PRIMARY_LABEL = "normal primary residence"
 
-def fetch_total(value: str, district: str) -> str | None:
-    with requests.Session() as s:
+# "$1,234.56", "-$12.00" or "($12.00)"; credits come back as "-12.00".
+_MONEY_RE = re.compile(r"(\()?(-)?\$?([\d,]+\.\d{2})(\))?", re.A)
+
+try:
+    import lxml  # noqa: F401
+    _PARSER = "lxml"
+except ImportError:
+    _PARSER = "html.parser"
+
+
+# bs4 and requests load on first use, not when the Tax tab is built.
+@functools.lru_cache(maxsize=None)
+def _rows_only():
+    # Only <tr> elements are built; the banner, form and footer markup is skipped.
+    from bs4 import SoupStrainer
+    return SoupStrainer("tr")
+
+
+def parse_amount(text: str) -> str | None:
+    """The first money amount in text without its "$", negatives as "-12.00"."""
+    m = _MONEY_RE.search(text)
+    if not m:
+        return None
+    parens, minus, amount, close = m.groups()
+    return "-" + amount if minus or (parens and close) else amount
+
+
+def parse_estimate(html: str) -> list[tuple[str, str]]:
+    """Return (label, amount) for every money row in an estimator response.
+
+    Covers the primary residence and non-homestead rows (labelled by their
+    image alt text) as well as the district breakdown (labelled by the first
+    cell), in page order.
+    """
+    from bs4 import BeautifulSoup
+    return _estimate_rows(BeautifulSoup(html, _PARSER, parse_only=_rows_only()))
+
+
+def _estimate_rows(soup) -> list[tuple[str, str]]:
+    rows = []
+    for tr in soup.find_all("tr"):
+        if tr.find("tr"):
+            continue  # layout row wrapping a nested table
+        cells = tr.find_all("td", recursive=False)
+        if not cells:
+            continue
+        amount = parse_amount(cells[-1].get_text())
+        if amount is None:
+            continue
+        img = tr.find("img", alt=True)
+        label = img["alt"] if img else cells[0].get_text(" ", strip=True)
+        rows.append((label.strip(), amount))
+    return rows
+
+
+_local = threading.local()
+
+
+def _http():
+    """This thread's keep-alive session; the estimator is two requests per lookup."""
+    session = getattr(_local, "session", None)
+    if session is None:
+        import requests
+        session = _local.session = requests.Session()
+    return session
+
+
+def fetch_estimate(value: str, district: str) -> list[tuple[str, str]]:
+    s = _http()
+    with perf.span("http", call="tax.welcome"):
         s.get(WELCOME, headers=UA_HDR, timeout=10)
-        payload = {"apprval": value,
-                   "millage": DISTRICT_MAP[district],
-                   "Calc": "Calculate"}
+    payload = {"apprval": value,
+               "millage": DISTRICT_MAP[district],
+               "Calc": "Calculate"}
+    with perf.span("http", call="tax.estimate", district=district):
         r = s.post(CGI, headers=UA_HDR, data=payload, timeout=10)
         r.raise_for_status()
-        soup = BeautifulSoup(r.text, "html.parser")
-        img = soup.find("img", alt=re.compile("normal primary residence", re.I))
-        if not img:
-            return None
-        row = img.find_parent("tr")
-        if not row:
-            return None
-        cells = row.find_all("td")
-        if not cells:
-            return None
-        m = _MONEY_RE.search(cells[-1].get_text())
-        return m.group(1) if m else None
+    return parse_estimate(r.text)
+
+
+def primary_total(rows: list[tuple[str, str]]) -> str | None:
+    for label, amount in rows:
+        if PRIMARY_LABEL in label.lower():
+            return amount
+    return None
+
+
+def fetch_total(value: str, district: str) -> str | None:
+    return primary_total(fetch_estimate(value, district))
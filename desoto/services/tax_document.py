@@ -4,6 +4,8 @@ import PyPDF2
 from typing import Optional, Tuple
 from docx import Document
 
+from desoto import perf
+
 def extract_tax_info_from_pdf(pdf_stream) -> Tuple[bool, str, Optional[str], Optional[str]]:
     """
     Extract 2024 tax information from a tax document PDF stream.
@@ -30,7 +32,7 @@ def extract_tax_info_from_pdf(pdf_stream) -> Tuple[bool, str, Optional[str], Opt
                     if page_text:
                         text += page_text + "\n"
         except Exception as e:
-            print(f"pdfplumber extraction failed: {e}, falling back to PyPDF2")
+            perf.warn(f"pdfplumber extraction failed: {e}, falling back to PyPDF2")
             text = ""
         
         # Fallback to PyPDF2 if pdfplumber fails
@@ -178,12 +180,15 @@ def process_tax_document(file_path: Optional[str] = None, file_bytes: Optional[b
         file_ext = '.pdf'
     
     if file_ext == '.pdf':
-        if file_bytes:
-            with io.BytesIO(file_bytes) as stream:
-                return extract_tax_info_from_pdf(stream)
-        else: # file_path must exist
-            with open(file_path, 'rb') as stream:
-                return extract_tax_info_from_pdf(stream)
+        with perf.span("tax-parse") as s:
+            if file_bytes:
+                with io.BytesIO(file_bytes) as stream:
+                    result = extract_tax_info_from_pdf(stream)
+            else: # file_path must exist
+                with open(file_path, 'rb') as stream:
+                    result = extract_tax_info_from_pdf(stream)
+            s.set(found=result[0])
+        return result
 
     elif file_ext == '.docx':
         try:
@@ -3,8 +3,11 @@ import io
 import PyPDF2
 from datetime import datetime, timedelta
 from dataclasses import dataclass
+from functools import cached_property
 from typing import List, Optional
 from docx import Document
+from desoto import perf
+from desoto.services.docx_template import fill_chain_table, is_chain_table, save_document
 import os
 
 @dataclass
@@ -19,6 +22,23 @@ class ChainEntry:
     is_vesting: bool = False
     line: str = ""
 
+    @property
+    def key(self) -> tuple:
+        """Identity used to match entries across the kept and full lists."""
+        return (self.date_string, self.book_page, self.instrument)
+
+    @cached_property
+    def sort_keys(self) -> dict:
+        """Per-field sort keys, computed once so large chains re-sort cheaply."""
+        m = re.match(r'(\d+)-(\d+)', self.book_page or "")
+        return {
+            "date": self.date or datetime.min,
+            "grantor": (self.grantor or "").lower(),
+            "grantee": (self.grantee or "").lower(),
+            "instrument": (self.instrument or "").lower(),
+            "book_page": (int(m.group(1)), int(m.group(2))) if m else (0, 0),
+        }
+
 def extract_text_from_pdf(pdf_stream) -> str:
     """Extract text from PDF stream using pdfplumber first, then fall back to PyPDF2."""
     text = ""
@@ -31,7 +51,7 @@ def extract_text_from_pdf(pdf_stream) -> str:
                 if page_text:
                     text += page_text + "\n"
     except Exception as e:
-        print(f"pdfplumber extraction failed: {e}")
+        perf.warn(f"pdfplumber extraction failed: {e}")
 
     if text.strip():
         return text
@@ -45,7 +65,7 @@ def extract_text_from_pdf(pdf_stream) -> str:
             if page_text:
                 text += page_text + "\n"
     except Exception as e:
-        print(f"PyPDF2 extraction failed: {e}")
+        perf.warn(f"PyPDF2 extraction failed: {e}")
     return text
 
 def extract_table_entries_from_pdf(pdf_stream) -> List[ChainEntry]:
@@ -154,7 +174,7 @@ def extract_table_entries_from_pdf(pdf_stream) -> List[ChainEntry]:
                         )
                         entries.append(entry)
     except Exception as e:
-        print(f"Table extraction failed: {e}")
+        perf.warn(f"Table extraction failed: {e}")
 
     # Sort newest first
     entries.sort(key=lambda e: e.date, reverse=True)
@@ -797,18 +817,24 @@ def process_title_document(file_path: Optional[str] = None, file_bytes: Optional
             # Use a context manager for both BytesIO and file open
             stream_manager = io.BytesIO(file_bytes) if file_bytes else open(file_path, 'rb')
             with stream_manager as stream:
-                try:
-                    entries = extract_table_entries_from_pdf(stream)
-                    stream.seek(0)  # Reset stream for re-reading
-                except Exception:
-                    entries = [] # Ensure entries is empty on failure
+                with perf.span("table-extract") as s:
+                    try:
+                        entries = extract_table_entries_from_pdf(stream)
+                        stream.seek(0)  # Reset stream for re-reading
+                    except Exception:
+                        entries = [] # Ensure entries is empty on failure
+                    s.set(entries=len(entries))
                 
-                text = extract_text_from_pdf(stream)
+                with perf.span("text-extract") as s:
+                    text = extract_text_from_pdf(stream)
+                    s.set(chars=len(text))
 
         elif file_ext == '.docx':
             doc_source = io.BytesIO(file_bytes) if file_bytes else file_path
-            doc = Document(doc_source)
-            text = '\n'.join([p.text for p in doc.paragraphs])
+            with perf.span("text-extract", source="docx") as s:
+                doc = Document(doc_source)
+                text = '\n'.join([p.text for p in doc.paragraphs])
+                s.set(chars=len(text))
         else:
             return False, f"Unsupported file type: {file_ext}", [], []
         
@@ -817,13 +843,17 @@ def process_title_document(file_path: Optional[str] = None, file_bytes: Optional
         
         # If table-based extraction was unsuccessful, fall back to text parsing
         if not entries:
-            entries = parse_chain_text(text)
+            with perf.span("parse") as s:
+                entries = parse_chain_text(text)
+                s.set(entries=len(entries))
         
         if not entries:
             return False, "No chain entries found", [], []
         
         # Get 24-month chain
-        chain_deeds = get_24_month_chain(entries)
+        with perf.span("chain-select") as s:
+            chain_deeds = get_24_month_chain(entries)
+            s.set(entries=len(entries), deeds=len(chain_deeds))
         
         # Create output document if requested
         if output_path and template_path:
@@ -840,36 +870,18 @@ def process_title_document(file_path: Optional[str] = None, file_bytes: Optional
 def create_title_document(chain_deeds: List[ChainEntry], output_path: str, template_path: str) -> bool:
     """Create the output document from template."""
     try:
-        doc = Document(template_path)
+        with open(template_path, 'rb') as f:
+            source = f.read()
+        doc = Document(io.BytesIO(source))
         
         # Find the chain table
-        chain_table = None
-        for table in doc.tables:
-            if len(table.rows) > 0:
-                header_text = ' '.join([cell.text.upper() for cell in table.rows[0].cells])
-                if 'GRANTOR' in header_text and 'GRANTEE' in header_text:
-                    chain_table = table
-                    break
-        
+        chain_table = next((t for t in doc.tables if is_chain_table(t)), None)
         if chain_table:
-            # Clear existing data rows
-            while len(chain_table.rows) > 1:
-                chain_table._element.remove(chain_table.rows[-1]._element)
-            
-            # Add chain data
-            for deed in chain_deeds:
-                row = chain_table.add_row()
-                cells = row.cells
-                if len(cells) >= 5:
-                    cells[0].text = deed.grantor
-                    cells[1].text = deed.grantee
-                    cells[2].text = deed.instrument
-                    cells[3].text = deed.date_string
-                    cells[4].text = deed.book_page
+            fill_chain_table(chain_table, chain_deeds)
         
-        doc.save(output_path)
+        save_document(doc, source, output_path)
         return True
         
     except Exception as e:
-        print(f"Error creating document: {e}")
+        perf.warn(f"Error creating document: {e}")
         return False
\ No newline at end of file
@@ -0,0 +1,167 @@
+"""Saved orders, so a closed or earlier order reopens without re-parsing.
+
+Each order is one row of a small SQLite file (~/.desoto/sessions.sqlite, or
+DESOTO_SESSIONS) keyed by its PIN, or by the search document when there is
+no PIN yet; once the PIN is known the Processing tab replaces that doc: row
+with the pin: one. The row holds the SharedData values, the form fields
+that live only in the Processing tab, and the parsed title chain as
+zlib-compressed JSON. The chain is stored once, with the kept entries as
+indices into it, so the user's kept/other choices come back exactly.
+Loading is a primary key read and a decode: no PDF parsing and no network.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import datetime
+
+SESSIONS_PATH = os.environ.get(
+    "DESOTO_SESSIONS",
+    os.path.join(os.path.expanduser("~"), ".desoto", "sessions.sqlite"),
+)
+FORMAT = 1
+RECENT = 15        # orders offered in the Processing tab
+KEEP = 500         # older orders are pruned on save
+CHAIN_KEYS = ("title_chain_all", "title_chain_kept")
+
+_lock = threading.Lock()
+_local = threading.local()
+
+
+def _connect(path=None) -> sqlite3.Connection:
+    path = path or SESSIONS_PATH
+    conns = getattr(_local, "conns", None)
+    if conns is None:
+        conns = _local.conns = {}
+    conn = conns.get(path)
+    if conn is None:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        conn = conns[path] = sqlite3.connect(path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("""CREATE TABLE IF NOT EXISTS orders (
+                            key TEXT PRIMARY KEY, label TEXT, saved_at REAL, payload BLOB)""")
+        conn.execute("CREATE INDEX IF NOT EXISTS orders_saved ON orders (saved_at)")
+    return conn
+
+
+# ── chain encoding ────────────────────────────────────────────
+def _entry_row(e) -> list:
+    return [e.date.isoformat() if e.date else None, e.date_string, e.grantor, e.grantee,
+            e.instrument, e.book_page, e.remark, e.is_vesting, e.line]
+
+
+def _entry(row):
+    from desoto.services.title_chain import ChainEntry
+    date, date_string, grantor, grantee, instrument, book_page, remark, is_vesting, line = row
+    return ChainEntry(date=datetime.fromisoformat(date) if date else None, date_string=date_string,
+                      grantor=grantor, grantee=grantee, instrument=instrument, book_page=book_page,
+                      remark=remark, is_vesting=is_vesting, line=line)
+
+
+def _encode_chain(all_entries, kept):
+    """(rows, count of all_entries, kept indices); kept entries missing from all are appended."""
+    entries = list(all_entries)
+    by_id = {id(e): i for i, e in enumerate(entries)}
+    by_key = {}
+    for i, e in enumerate(entries):
+        by_key.setdefault(e.key, i)
+    indices = []
+    for e in kept:
+        i = by_id.get(id(e), by_key.get(e.key))
+        if i is None:
+            i = len(entries)
+            entries.append(e)
+        indices.append(i)
+    return [_entry_row(e) for e in entries], len(all_entries), indices
+
+
+# ── orders ────────────────────────────────────────────────────
+def order_key(data: dict, form: dict) -> str | None:
+    if data.get("parcel_pin"):
+        return "pin:" + data["parcel_pin"].strip()
+    if form.get("search_doc"):
+        return "doc:" + os.path.abspath(form["search_doc"])
+    if data.get("parcel_address"):
+        return "addr:" + " ".join(data["parcel_address"].upper().split())
+    return None
+
+
+def order_label(data: dict, form: dict) -> str:
+    parts = [data.get("parcel_pin"), data.get("parcel_address")]
+    label = " - ".join(p for p in parts if p)
+    return label or os.path.basename(form.get("search_doc") or "") or "Untitled order"
+
+
+def save(data, form=None, path=None) -> str | None:
+    """Store one order (SharedData values plus form fields); returns its key, or None if it has none."""
+    form = dict(form or {})
+    key = order_key(data, form)
+    if key is None:
+        return None
+    rows, n_all, kept = _encode_chain(data.get("title_chain_all") or (), data.get("title_chain_kept") or ())
+    values = {k: v for k, v in data.items() if k not in CHAIN_KEYS and isinstance(v, str)}
+    payload = {"format": FORMAT, "data": values, "form": form,
+               "chain": rows, "all": n_all, "kept": kept}
+    blob = zlib.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+    try:
+        with _lock:
+            conn = _connect(path)
+            with conn:
+                conn.execute("INSERT OR REPLACE INTO orders VALUES (?, ?, ?, ?)",
+                             (key, order_label(data, form), time.time(), blob))
+                conn.execute("""DELETE FROM orders WHERE key NOT IN
+                                (SELECT key FROM orders ORDER BY saved_at DESC LIMIT ?)""", (KEEP,))
+    except sqlite3.Error as e:
+        print(f"Could not save order {key}: {e}")
+        return None
+    return key
+
+
+def load(key, path=None) -> dict | None:
+    """{"key", "label", "saved_at", "data", "form"} with ChainEntry lists under CHAIN_KEYS in data."""
+    try:
+        row = _connect(path).execute(
+            "SELECT label, saved_at, payload FROM orders WHERE key = ?", (key,)).fetchone()
+    except sqlite3.Error as e:
+        print(f"Could not read saved order {key}: {e}")
+        return None
+    if row is None:
+        return None
+    label, saved_at, blob = row
+    try:
+        payload = json.loads(zlib.decompress(blob))
+        if payload.get("format") != FORMAT:
+            return None
+        entries = [_entry(r) for r in payload["chain"]]
+        data = dict(payload["data"])
+        data["title_chain_all"] = entries[:payload["all"]]
+        data["title_chain_kept"] = [entries[i] for i in payload["kept"]]
+        form = payload["form"]
+    except (zlib.error, ValueError, TypeError, KeyError, IndexError, AttributeError) as e:
+        print(f"Saved order {key} is unreadable: {e}")
+        return None
+    return {"key": key, "label": label, "saved_at": saved_at, "data": data, "form": form}
+
+
+def delete(key, path=None):
+    """Remove a saved order, e.g. a doc: row superseded by the order's pin: row."""
+    try:
+        with _lock:
+            conn = _connect(path)
+            with conn:
+                conn.execute("DELETE FROM orders WHERE key = ?", (key,))
+    except sqlite3.Error as e:
+        print(f"Could not delete saved order {key}: {e}")
+
+
+def recent(limit=RECENT, path=None) -> list[tuple[str, str, float]]:
+    """(key, label, saved_at) of the most recently saved orders, newest first."""
+    try:
+        return _connect(path).execute(
+            "SELECT key, label, saved_at FROM orders ORDER BY saved_at DESC LIMIT ?", (limit,)).fetchall()
+    except sqlite3.Error as e:
+        print(f"Could not read saved orders: {e}")
+        return []
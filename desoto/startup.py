@@ -0,0 +1,146 @@
+"""Cold-start profiling and background warm-up of the heavy dependencies.
+
+    python -m desoto.startup [--top 25] [--window]
+
+The window only needs Tk, ttkbootstrap and the tab modules. requests,
+BeautifulSoup, PyPDF2, python-docx and pdfplumber load on first use through
+the lazy desoto.services package; warm_up() imports them on a background
+job once the first frame is drawn, and builds the in-memory address index,
+so the first search or document drop doesn't pay for them.
+
+The profiler imports desoto.app in a fresh interpreter with -X importtime
+and prints the slowest modules by cumulative time, the total, and any heavy
+module that slipped back into the startup path. With --window it also
+times a fresh process from launch until the App's first frame is drawn.
+"""
+import argparse
+import importlib
+import os
+import subprocess
+import sys
+import time
+
+from desoto import jobs
+
+# Loaded by warm_up(); none of them should be imported by desoto.app itself.
+HEAVY_MODULES = (
+    "desoto.services.parcels",          # requests
+    "desoto.services.document_splitter",
+    "desoto.services.title_chain",      # PyPDF2, python-docx
+    "desoto.services.tax_document",
+    "desoto.services.document_render",
+    "bs4",
+    "pdfplumber",
+)
+WARM_UP_DELAY_MS = 250  # after App() returns, so the first frame is painted first
+TARGET_MS = 500
+
+_WINDOW_PROBE = """
+from desoto.app import App
+app = App()
+app.update()
+print("ready", flush=True)
+app.destroy()
+"""
+
+
+def preload() -> dict:
+    """Import the heavy modules now; returns seconds spent per module."""
+    timings = {}
+    for name in HEAVY_MODULES:
+        started = time.perf_counter()
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            continue  # optional (pdfplumber): loaded on first use, if ever
+        timings[name] = time.perf_counter() - started
+    return timings
+
+
+def warm_up():
+    """Import the heavy modules and build the address index on background jobs."""
+    from desoto.services import address_index
+    address_index.set_scheduler(
+        lambda fn, *args: jobs.submit(fn, *args, category="index", priority=jobs.BACKGROUND))
+    address_index.warm()
+    return jobs.submit(preload, category="warmup", priority=jobs.BACKGROUND)
+
+
+def schedule_warm_up(widget, delay_ms=WARM_UP_DELAY_MS):
+    widget.after(delay_ms, warm_up)
+
+
+# ── profiler ────────────────────────────────────────────────────
+def import_times(module="desoto.app"):
+    """(module, self_ms, cumulative_ms, depth) for each import of module in a fresh interpreter."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          capture_output=True, text=True, cwd=_root())
+    if proc.returncode:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "import failed")
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        if not self_us.strip().isdigit():
+            continue  # header
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us) / 1000, int(cumulative_us) / 1000, depth))
+    return rows
+
+
+def window_time(runs=3):
+    """Best wall time in ms from process launch to the App's first drawn frame."""
+    best = None
+    for _ in range(runs):
+        started = time.perf_counter()
+        proc = subprocess.Popen([sys.executable, "-c", _WINDOW_PROBE], cwd=_root(),
+                                stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        line = proc.stdout.readline()
+        elapsed = (time.perf_counter() - started) * 1000
+        _, err = proc.communicate()
+        if line.strip() != "ready":
+            raise RuntimeError(err.strip().splitlines()[-1] if err.strip() else "no window")
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def _root():
+    return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Report desoto.app import time per module.")
+    ap.add_argument("--top", type=int, default=25, help="modules to list")
+    ap.add_argument("--window", action="store_true", help="also time launch to first frame (needs a display)")
+    args = ap.parse_args(argv)
+
+    try:
+        rows = import_times()
+    except RuntimeError as e:
+        print(f"Could not import desoto.app: {e}")
+        return 1
+    total = next((cum for name, _, cum, depth in rows if name == "desoto.app" and depth == 0), 0.0)
+    print(f"{'cumulative':>10}  {'self':>8}  module")
+    for name, self_ms, cum_ms, depth in sorted(rows, key=lambda r: -r[2])[:args.top]:
+        print(f"{cum_ms:8.1f}ms  {self_ms:6.1f}ms  {'  ' * depth}{name}")
+    print(f"import desoto.app: {total:.0f} ms")
+
+    loaded = {name for name, _, _, _ in rows}
+    eager = [m for m in HEAVY_MODULES if m in loaded]
+    if eager:
+        print(f"loaded at startup but meant to be lazy: {', '.join(eager)}")
+
+    if args.window:
+        try:
+            ms = window_time()
+        except RuntimeError as e:
+            print(f"Could not open the window: {e}")
+            return 1
+        verdict = "ok" if ms <= TARGET_MS else f"over the {TARGET_MS} ms target"
+        print(f"launch to first frame: {ms:.0f} ms ({verdict})")
+    return 1 if eager else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
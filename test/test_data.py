@@ -0,0 +1,106 @@
+import unittest
+
+from desoto.data import MAX_CASCADE, SharedData
+
+
+class SubscribeTest(unittest.TestCase):
+    def setUp(self):
+        self.queued = []
+        self.data = SharedData(dispatch=self.queued.append)
+
+    def flush(self):
+        while self.queued:
+            self.queued.pop(0)()
+
+    def test_burst_is_one_batch_with_the_latest_value(self):
+        seen = []
+        self.data.subscribe("parcel_pin", seen.append)
+        for pin in ("1", "12", "123"):
+            self.data.set_data("parcel_pin", pin)
+        self.assertEqual(len(self.queued), 1)
+        self.flush()
+        self.assertEqual(seen, ["123"])
+
+    def test_unchanged_value_notifies_nobody(self):
+        seen = []
+        self.data.subscribe("lender", seen.append)
+        self.data.set_data("lender", "")
+        self.assertEqual(self.queued, [])
+        self.assertEqual(seen, [])
+
+    def test_only_the_changed_key_is_delivered(self):
+        pins, owners = [], []
+        self.data.subscribe("parcel_pin", pins.append)
+        self.data.subscribe("parcel_owner", owners.append)
+        self.data.set_data("parcel_owner", "DOE JANE")
+        self.flush()
+        self.assertEqual((pins, owners), ([], ["DOE JANE"]))
+
+    def test_unsubscribe(self):
+        seen = []
+        unsubscribe = self.data.subscribe("borrower", seen.append)
+        unsubscribe()
+        self.data.set_data("borrower", "SMITH")
+        self.flush()
+        self.assertEqual(seen, [])
+
+    def test_feedback_loop_is_dropped_after_max_cascade(self):
+        rounds = []
+
+        def echo(value):
+            rounds.append(value)
+            self.data.set_data("loan_amount", str(int(value) + 1))
+        self.data.subscribe("loan_amount", echo)
+        self.data.set_data("loan_amount", "0")
+        self.flush()
+        self.assertEqual(len(rounds), MAX_CASCADE + 1)
+
+    def test_default_dispatch_is_synchronous(self):
+        data, seen = SharedData(), []
+        data.subscribe("parcel_pin", seen.append)
+        data.set_data("parcel_pin", "9")
+        self.assertEqual(seen, ["9"])
+
+
+class SnapshotTest(unittest.TestCase):
+    def setUp(self):
+        self.data = SharedData()
+
+    def test_snapshot_is_read_only_and_keeps_its_values(self):
+        before = self.data.snapshot()
+        self.data.set_data("parcel_pin", "123")
+        self.assertEqual(before.get("parcel_pin"), "")
+        self.assertEqual(self.data.snapshot()["parcel_pin"], "123")
+        with self.assertRaises(TypeError):
+            before.values["parcel_pin"] = "x"
+
+    def test_lists_are_frozen(self):
+        chain = ["a", "b"]
+        self.data.set_data("title_chain_kept", chain)
+        chain.append("c")
+        self.assertEqual(self.data.get_data("title_chain_kept"), ("a", "b"))
+
+    def test_version_moves_only_on_real_changes(self):
+        version = self.data.version
+        self.data.update_data({"parcel_pin": "1", "parcel_owner": "DOE"})
+        self.assertEqual(self.data.version, version + 1)
+        self.data.update_data({"parcel_pin": "1"})
+        self.assertEqual(self.data.version, version + 1)
+
+    def test_update_data_ignores_unknown_keys(self):
+        self.data.update_data({"not_a_field": "x"})
+        self.assertIsNone(self.data.get_data("not_a_field"))
+        self.data.set_data("not_a_field", "x")
+        self.assertEqual(self.data.get_data("not_a_field"), "x")
+
+    def test_changed_since(self):
+        start = self.data.snapshot()
+        self.assertFalse(self.data.changed_since(start))
+        self.data.set_data("lender", "BANK")
+        self.assertTrue(self.data.changed_since(start))
+        self.assertTrue(self.data.changed_since(start, ["lender"]))
+        self.assertFalse(self.data.changed_since(start, ["parcel_pin", "tax_2024_total"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
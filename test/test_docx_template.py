@@ -0,0 +1,50 @@
+import unittest
+
+from docx import Document
+
+from desoto.services.docx_template import replace_in_paragraph
+
+
+def paragraph(*runs):
+    p = Document().add_paragraph()
+    for text in runs:
+        p.add_run(text)
+    return p
+
+
+class ReplaceInParagraphTest(unittest.TestCase):
+    def test_placeholder_within_one_run(self):
+        p = paragraph("Parcel {PARCEL} in {CITY}")
+        replace_in_paragraph(p, {"PARCEL": "1234", "CITY": "Hernando"})
+        self.assertEqual(p.text, "Parcel 1234 in Hernando")
+
+    def test_placeholder_split_across_runs_keeps_first_run_formatting(self):
+        p = paragraph("Owner: {SLR", "LA", "ST} today")
+        p.runs[0].bold = True
+        replace_in_paragraph(p, {"SLRLAST": "Doe"})
+        self.assertEqual([r.text for r in p.runs], ["Owner: Doe", "", " today"])
+        self.assertTrue(p.runs[0].bold)
+
+    def test_several_keys_in_one_scan(self):
+        p = paragraph("{A}", "-{B}-", "{A}")
+        replace_in_paragraph(p, {"A": "x", "B": "yy"})
+        self.assertEqual(p.text, "x-yy-x")
+
+    def test_longer_key_wins(self):
+        p = paragraph("{TAX} {TAXDAT}")
+        replace_in_paragraph(p, {"TAX": "1", "TAXDAT": "2024-01-31"})
+        self.assertEqual(p.text, "1 2024-01-31")
+
+    def test_unknown_placeholders_and_values_with_braces_are_left_alone(self):
+        p = paragraph("{A} {UNKNOWN}")
+        replace_in_paragraph(p, {"A": "{A}{A}"})
+        self.assertEqual(p.text, "{A}{A} {UNKNOWN}")
+
+    def test_untouched_paragraph_keeps_its_runs(self):
+        p = paragraph("no ", "keys")
+        replace_in_paragraph(p, {"A": "x"})
+        self.assertEqual([r.text for r in p.runs], ["no ", "keys"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+import threading
+import time
+import unittest
+
+from desoto import jobs
+from desoto.jobs import BACKGROUND, INTERACTIVE, JobExecutor
+
+TIMEOUT = 5
+
+
+def wait_for(condition):
+    """Callbacks are posted after the job's result is set, so poll for them."""
+    deadline = time.monotonic() + TIMEOUT
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return condition()
+
+
+class ExecutorTest(unittest.TestCase):
+    def executor(self, **kwargs):
+        return JobExecutor(inline=True, **kwargs)
+
+    def block(self, executor, category="default"):
+        """Occupy a worker until the returned event is set."""
+        started, release = threading.Event(), threading.Event()
+
+        def hold():
+            started.set()
+            release.wait(TIMEOUT)
+        job = executor.submit(hold, category=category)
+        self.assertTrue(started.wait(TIMEOUT))
+        return job, release
+
+    def test_interactive_jobs_run_before_background_ones(self):
+        ex = self.executor(workers=1)
+        _, release = self.block(ex)
+        order = []
+        later = [ex.submit(order.append, "bulk", priority=BACKGROUND),
+                 ex.submit(order.append, "bulk 2", priority=BACKGROUND),
+                 ex.submit(order.append, "typed", priority=INTERACTIVE)]
+        release.set()
+        for job in later:
+            job.result(TIMEOUT)
+        self.assertEqual(order, ["typed", "bulk", "bulk 2"])
+
+    def test_category_limit_caps_concurrency(self):
+        ex = self.executor(workers=4, limits={"tax": 1})
+        lock, running, peak = threading.Lock(), [0], [0]
+
+        def work():
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.02)
+            with lock:
+                running[0] -= 1
+        for job in [ex.submit(work, category="tax") for _ in range(4)]:
+            job.result(TIMEOUT)
+        self.assertEqual(peak[0], 1)
+
+    def test_same_key_coalesces_onto_one_job(self):
+        ex = self.executor(workers=1)
+        _, release = self.block(ex)
+        calls, first, second = [], [], []
+
+        def fetch():
+            calls.append(1)
+            return "rows"
+        a = ex.submit(fetch, key="q", on_done=first.append)
+        b = ex.submit(fetch, key="q", on_done=second.append)
+        self.assertIs(a, b)
+        release.set()
+        self.assertEqual(a.result(TIMEOUT), "rows")
+        self.assertTrue(wait_for(lambda: first and second))
+        self.assertEqual((calls, first, second), ([1], ["rows"], ["rows"]))
+        # Once it has finished, the key starts fresh work.
+        ex.submit(fetch, key="q").result(TIMEOUT)
+        self.assertEqual(len(calls), 2)
+
+    def test_cancelled_queued_job_never_runs(self):
+        ex = self.executor(workers=1)
+        _, release = self.block(ex)
+        ran = []
+        job = ex.submit(ran.append, 1)
+        self.assertTrue(job.cancel())
+        release.set()
+        ex.submit(lambda: None).result(TIMEOUT)
+        self.assertEqual(ran, [])
+
+    def test_cancelled_running_job_drops_its_callbacks(self):
+        ex = self.executor(workers=1)
+        started, release, done = threading.Event(), threading.Event(), []
+
+        def work():
+            started.set()
+            release.wait(TIMEOUT)
+            return 1
+        job = ex.submit(work, on_done=done.append)
+        self.assertTrue(started.wait(TIMEOUT))
+        job.cancel()
+        release.set()
+        self.assertEqual(job.result(TIMEOUT), 1)
+        time.sleep(0.05)
+        self.assertEqual(done, [])
+
+    def test_error_goes_to_on_error(self):
+        ex = self.executor()
+        errors = []
+        job = ex.submit(lambda: 1 / 0, on_error=errors.append)
+        with self.assertRaises(ZeroDivisionError):
+            job.result(TIMEOUT)
+        self.assertTrue(wait_for(lambda: errors))
+        self.assertIsInstance(errors[0], ZeroDivisionError)
+
+
+class PostTest(unittest.TestCase):
+    def test_inline_runs_on_the_calling_thread(self):
+        out = []
+        JobExecutor(inline=True).post(out.append, threading.current_thread())
+        self.assertEqual(out, [threading.current_thread()])
+
+    def test_posts_wait_for_attach_and_are_dropped_after_close(self):
+        ex, out = JobExecutor(), []
+        ex.post(out.append, 1)
+        self.assertEqual((out, ex._ui.qsize()), ([], 1))
+        ex._close()  # the attached window was destroyed
+        ex.post(out.append, 2)
+        self.assertEqual((out, ex._ui.qsize()), ([], 0))
+
+    def test_run_inline_switches_the_default_executor(self):
+        saved = jobs._executor
+        jobs._executor = None
+        try:
+            jobs.run_inline()
+            out = []
+            jobs.post(out.append, 1)
+            self.assertEqual(out, [1])
+        finally:
+            jobs._executor = saved
+
+
+if __name__ == "__main__":
+    unittest.main()
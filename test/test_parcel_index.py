@@ -0,0 +1,51 @@
+import os
+import tempfile
+import unittest
+
+from desoto.services import parcel_index
+
+
+def _parcel(oid, addr, owner):
+    return {"OBJECTID": oid, "FULL_ADDR": addr, "PIN": f"PIN{oid}", "OWNER_NAME": owner}
+
+
+class UpsertTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "parcels.sqlite")
+        self.conn = parcel_index.connect(self.path)
+
+    def tearDown(self):
+        self.conn.close()
+        self.dir.cleanup()
+
+    def fts(self, query):
+        return self.conn.execute(
+            "SELECT rowid FROM parcels_fts WHERE parcels_fts MATCH ?", (query,)).fetchall()
+
+    def test_changed_row_replaces_fts_tokens(self):
+        parcel_index.upsert(self.conn, [_parcel(1, "100 OAK ST", "SMITH JOHN")])
+        self.conn.commit()
+        self.assertEqual(self.fts("OAK"), [(1,)])
+
+        parcel_index.upsert(self.conn, [_parcel(1, "200 ELM ST", "DOE JANE")])
+        self.conn.commit()
+
+        self.assertEqual(self.fts("OAK"), [])
+        self.assertEqual(self.fts("SMITH"), [])
+        self.assertEqual(self.fts("ELM"), [(1,)])
+        self.assertEqual(self.fts("DOE"), [(1,)])
+        self.assertEqual(self.conn.execute("SELECT COUNT(*) FROM parcels").fetchone()[0], 1)
+        self.assertEqual(parcel_index.search("OAK", path=self.path), [])
+        self.assertEqual(parcel_index.search("ELM", path=self.path)[0]["FULL_ADDR"], "200 ELM ST")
+
+    def test_integrity_after_update(self):
+        parcel_index.upsert(self.conn, [_parcel(1, "100 OAK ST", "SMITH JOHN"),
+                                        _parcel(2, "5 PINE RD", "ROE RICHARD")])
+        parcel_index.upsert(self.conn, [_parcel(2, "7 PINE RD", "ROE RICHARD")])
+        self.conn.commit()
+        self.conn.execute("INSERT INTO parcels_fts(parcels_fts, rank) VALUES ('integrity-check', 1)")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import time
+import unittest
+
+from desoto.services.parcels import PrefixCache
+
+
+def rows(*addresses):
+    return [{"FULL_ADDR": a} for a in addresses]
+
+
+class PrefixCacheTest(unittest.TestCase):
+    def test_exact_prefix_hit(self):
+        cache = PrefixCache()
+        cache.put("12", 10, rows("12 OAK ST", "120 ELM ST"))
+        self.assertEqual(cache.get("12", 10), rows("12 OAK ST", "120 ELM ST"))
+        self.assertEqual(cache.get("12", 1), rows("12 OAK ST"))
+        self.assertEqual((cache.hits, cache.misses), (2, 0))
+
+    def test_full_page_does_not_answer_a_larger_limit(self):
+        cache = PrefixCache()
+        cache.put("1", 2, rows("1 A ST", "10 B ST"))  # limit reached: there may be more
+        self.assertIsNone(cache.get("1", 5))
+        self.assertIsNone(cache.get("10", 2))
+        self.assertEqual(cache.misses, 2)
+
+    def test_exhausted_prefix_narrows_locally(self):
+        cache = PrefixCache()
+        cache.put("12", 10, rows("12 OAK ST", "120 ELM ST", "125 PINE RD"))
+        self.assertEqual(cache.get("120", 10), rows("120 ELM ST"))
+        self.assertEqual(cache.get("12 O", 10), rows("12 OAK ST"))
+        self.assertEqual(cache.get("129", 10), [])
+
+    def test_expired_entries_are_misses(self):
+        cache = PrefixCache(ttl=0.01)
+        cache.put("12", 10, rows("12 OAK ST"))
+        time.sleep(0.02)
+        self.assertIsNone(cache.get("12", 10))
+        self.assertIsNone(cache.get("12 O", 10))
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = PrefixCache(maxsize=2)
+        cache.put("1", 10, rows("1 A ST"))
+        cache.put("2", 10, rows("2 B ST"))
+        cache.get("1", 10)
+        cache.put("3", 10, rows("3 C ST"))
+        self.assertIsNone(cache.get("2", 10))
+        self.assertEqual(cache.get("1", 10), rows("1 A ST"))
+
+
+if __name__ == "__main__":
+    unittest.main()
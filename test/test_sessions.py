@@ -0,0 +1,69 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+
+from desoto import sessions
+from desoto.services.title_chain import ChainEntry
+
+
+def _entry(n, vesting=False):
+    return ChainEntry(date=datetime(2020, 1, n), date_string=f"01/{n:02d}/2020",
+                      grantor=f"GRANTOR {n}", grantee=f"GRANTEE {n}", instrument="WD",
+                      book_page=f"{n}-{n}", is_vesting=vesting)
+
+
+class SessionsTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "sessions.sqlite")
+
+    def tearDown(self):
+        conn = getattr(sessions._local, "conns", {}).pop(self.path, None)
+        if conn is not None:
+            conn.close()
+        self.dir.cleanup()
+
+    def test_order_key(self):
+        self.assertEqual(sessions.order_key({"parcel_pin": " 1234 "}, {"search_doc": "a.pdf"}), "pin:1234")
+        self.assertEqual(sessions.order_key({}, {"search_doc": "a.pdf"}), "doc:" + os.path.abspath("a.pdf"))
+        self.assertEqual(sessions.order_key({"parcel_address": "12  oak st"}, {}), "addr:12 OAK ST")
+        self.assertIsNone(sessions.order_key({}, {}))
+
+    def test_save_and_load_round_trip(self):
+        chain = [_entry(1), _entry(2, vesting=True), _entry(3)]
+        other = _entry(9)  # kept but not in the parsed chain
+        data = {"parcel_pin": "1234", "parcel_address": "12 OAK ST", "version": 3,
+                "title_chain_all": chain, "title_chain_kept": [chain[1], other]}
+        key = sessions.save(data, {"search_doc": "a.pdf"}, path=self.path)
+        self.assertEqual(key, "pin:1234")
+
+        order = sessions.load(key, path=self.path)
+        self.assertEqual(order["label"], "1234 - 12 OAK ST")
+        self.assertEqual(order["form"], {"search_doc": "a.pdf"})
+        self.assertEqual(order["data"]["parcel_address"], "12 OAK ST")
+        self.assertNotIn("version", order["data"])  # only string values are stored
+        self.assertEqual(order["data"]["title_chain_all"], chain)
+        self.assertEqual(order["data"]["title_chain_kept"], [chain[1], other])
+        self.assertEqual(sessions.recent(path=self.path)[0][:2], (key, "1234 - 12 OAK ST"))
+
+    def test_order_without_key_is_not_saved(self):
+        self.assertIsNone(sessions.save({}, {}, path=self.path))
+        self.assertEqual(sessions.recent(path=self.path), [])
+
+    def test_delete(self):
+        key = sessions.save({}, {"search_doc": "a.pdf"}, path=self.path)
+        sessions.delete(key, path=self.path)
+        self.assertIsNone(sessions.load(key, path=self.path))
+        self.assertEqual(sessions.recent(path=self.path), [])
+
+    def test_corrupt_row_loads_as_none(self):
+        conn = sessions._connect(self.path)
+        with conn:
+            conn.execute("INSERT INTO orders VALUES ('pin:1', 'x', 0, ?)", (b"not zlib",))
+        self.assertIsNone(sessions.load("pin:1", path=self.path))
+        self.assertIsNone(sessions.load("pin:missing", path=self.path))
+
+
+if __name__ == "__main__":
+    unittest.main()
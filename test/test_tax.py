@@ -0,0 +1,36 @@
+import os
+import unittest
+
+from desoto.services.tax import parse_amount, parse_estimate
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "aptaxest7_response.html")
+
+
+class ParseAmountTest(unittest.TestCase):
+    def test_plain_amount_drops_the_dollar_sign(self):
+        self.assertEqual(parse_amount("$1,234.56"), "1,234.56")
+        self.assertEqual(parse_amount("  837.15 "), "837.15")
+
+    def test_credits_come_back_negative(self):
+        self.assertEqual(parse_amount("($300.00)"), "-300.00")
+        self.assertEqual(parse_amount("-$12.00"), "-12.00")
+
+    def test_unbalanced_parenthesis_is_not_a_credit(self):
+        self.assertEqual(parse_amount("(see note $5.00"), "5.00")
+
+    def test_no_amount(self):
+        self.assertIsNone(parse_amount("Total"))
+        self.assertIsNone(parse_amount("$12"))
+
+
+class ParseEstimateTest(unittest.TestCase):
+    def test_fixture_rows_in_page_order(self):
+        with open(FIXTURE, encoding="utf-8") as f:
+            rows = parse_estimate(f.read())
+        self.assertEqual(rows[:2], [("Normal Primary Residence", "1,702.35"),
+                                    ("Non-Homestead", "3,511.88")])
+        self.assertEqual(rows[-1], ("Homestead Credit", "-300.00"))
+
+
+if __name__ == "__main__":
+    unittest.main()